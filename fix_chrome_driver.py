@@ -7,45 +7,27 @@ ChromeDriver问题修复脚本
 
 import os
 import sys
-import subprocess
-import winreg
+import stat
 import requests
 import zipfile
 from pathlib import Path
 
-def get_chrome_version():
-    """获取Chrome浏览器版本"""
+# 添加src目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from utils.driver_resolver import (
+    DriverResolver, chrome_for_testing_platform, driver_filename
+)
+
+def get_chrome_version(resolver):
+    """获取Chrome浏览器版本（Chrome未变化时直接读取缓存清单）"""
     print("🔍 检测Chrome版本...")
     
     try:
-        # 方法1: 通过注册表
-        try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
-            version = winreg.QueryValueEx(key, "version")[0]
-            winreg.CloseKey(key)
+        version = resolver.chrome_version()
+        if version:
             print(f"✅ 检测到Chrome版本: {version}")
             return version
-        except:
-            pass
-        
-        # 方法2: 通过程序文件
-        chrome_paths = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe")
-        ]
-        
-        for chrome_path in chrome_paths:
-            if os.path.exists(chrome_path):
-                try:
-                    result = subprocess.run([chrome_path, "--version"], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        version = result.stdout.strip().split()[-1]
-                        print(f"✅ 检测到Chrome版本: {version}")
-                        return version
-                except:
-                    continue
         
         print("❌ 无法检测Chrome版本")
         return None
@@ -60,6 +42,7 @@ def get_chromedriver_download_url(chrome_version):
         return None
     
     major_version = chrome_version.split('.')[0]
+    platform_name = chrome_for_testing_platform()
     
     try:
         # Chrome 115+使用新的下载地址
@@ -78,14 +61,15 @@ def get_chromedriver_download_url(chrome_version):
                         chromedriver_downloads = downloads.get('chromedriver', [])
                         
                         for download in chromedriver_downloads:
-                            if download.get('platform') == 'win64':
+                            if download.get('platform') == platform_name:
                                 return download.get('url')
             
             # 备用链接
-            return f"https://storage.googleapis.com/chrome-for-testing-public/{chrome_version}/win64/chromedriver-win64.zip"
+            return f"https://storage.googleapis.com/chrome-for-testing-public/{chrome_version}/{platform_name}/chromedriver-{platform_name}.zip"
         else:
             # 旧版本Chrome
-            return f"https://chromedriver.storage.googleapis.com/{chrome_version}/chromedriver_win32.zip"
+            legacy_platform = {'win64': 'win32', 'linux64': 'linux64', 'mac-x64': 'mac64', 'mac-arm64': 'mac_arm64'}
+            return f"https://chromedriver.storage.googleapis.com/{chrome_version}/chromedriver_{legacy_platform.get(platform_name, platform_name)}.zip"
     
     except Exception as e:
         print(f"⚠️  获取下载链接失败: {e}")
@@ -119,21 +103,25 @@ def extract_chromedriver(zip_path, extract_dir):
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
             zip_ref.extractall(extract_dir)
         
-        # 查找chromedriver.exe文件
+        # 查找当前平台的chromedriver文件
+        target_name = driver_filename()
         for root, dirs, files in os.walk(extract_dir):
             for file in files:
-                if file == 'chromedriver.exe':
+                if file == target_name:
                     source_path = os.path.join(root, file)
-                    dest_path = extract_dir / "chromedriver.exe"
+                    dest_path = extract_dir / target_name
                     
                     # 移动到目标位置
                     if source_path != str(dest_path):
-                        os.rename(source_path, dest_path)
+                        os.replace(source_path, dest_path)
+                    
+                    # 非Windows平台需要可执行权限
+                    dest_path.chmod(dest_path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
                     
                     print(f"✅ 解压完成: {dest_path}")
                     return str(dest_path)
         
-        print("❌ 解压后未找到chromedriver.exe")
+        print(f"❌ 解压后未找到{target_name}")
         return None
         
     except Exception as e:
@@ -146,8 +134,10 @@ def fix_chromedriver():
     print("🛠️  ChromeDriver问题修复工具")
     print("="*60)
     
+    resolver = DriverResolver("drivers")
+    
     # 1. 检测Chrome版本
-    chrome_version = get_chrome_version()
+    chrome_version = get_chrome_version(resolver)
     if not chrome_version:
         print("\n❌ 无法检测Chrome版本，请确保已安装Chrome浏览器")
         print("下载地址: https://www.google.com/chrome/")
@@ -158,7 +148,7 @@ def fix_chromedriver():
     drivers_dir.mkdir(exist_ok=True)
     
     # 3. 检查是否已有ChromeDriver
-    chromedriver_path = drivers_dir / "chromedriver.exe"
+    chromedriver_path = resolver.local_driver_path()
     if chromedriver_path.exists():
         print(f"\n⚠️  发现已存在的ChromeDriver: {chromedriver_path}")
         replace = input("是否替换为新版本？(y/N): ").lower().strip()
@@ -200,6 +190,9 @@ def fix_chromedriver():
     except:
         pass
     
+    # 8. 记录到缓存清单，之后启动时无需再联网
+    resolver.record_driver(final_path, resolver.driver_version(final_path) or chrome_version)
+    
     print(f"\n🎉 ChromeDriver安装成功！")
     print(f"路径: {final_path}")
     
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线性能基准测试
+用本地HTTP服务器提供会员中心、listOrder列表页和详情页的录制样本（benchmarks/fixtures），
+用pyftpdlib作为本地FTP替身，在临时目录中运行完整的ZhaobiaoSpider流程，
+报告每秒处理条目数、各阶段耗时和峰值内存，结果写入logs/benchmark_时间戳.json
+
+用法: python run_benchmark.py --items 20 --pages 2 --conditions 2
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+FIXTURES_DIR = PROJECT_ROOT / "benchmarks" / "fixtures"
+
+INFO_TYPES = ["招标公告", "中标公告", "变更公告", "采购意向"]
+AREAS = ["北京", "上海", "广东", "浙江", "四川", "湖北"]
+PARAGRAPH = "本项目采购内容包括收单设备、报账终端及配套信息化系统的供货、安装与维护服务。"
+
+
+class FixtureSite:
+    """由录制样本生成的本地站点"""
+
+    def __init__(self, items_per_page, pages, detail_kb):
+        """加载样本模板"""
+        self.items_per_page = items_per_page
+        self.pages = pages
+        self.detail_kb = detail_kb
+        self.templates = {
+            name: Template((FIXTURES_DIR / f"{name}.html").read_text(encoding='utf-8'))
+            for name in ("home", "member_center", "list_order", "detail")
+        }
+
+    def item(self, condition_num, page, index):
+        """生成确定性的条目数据（同一参数每次结果相同）"""
+        rng = random.Random(f"{condition_num}-{page}-{index}")
+        pub_date = (datetime.now() - timedelta(days=rng.randint(0, 2))).strftime('%Y-%m-%d')
+        return {
+            'id': f"{condition_num}_{page}_{index}",
+            'title': f"定制条件{condition_num:02d}第{page}页项目{index:03d}设备采购项目",
+            'info_type': rng.choice(INFO_TYPES),
+            'area': rng.choice(AREAS),
+            'pub_date': pub_date
+        }
+
+    def list_order(self, condition_num, page):
+        """定制条件结果列表页"""
+        rows = []
+        for index in range(1, self.items_per_page + 1):
+            item = self.item(condition_num, page, index)
+            rows.append(
+                f'            <tr><td><a href="/detail/{item["id"]}.html" target="_blank">{item["title"]}</a></td>'
+                f'<td>{item["info_type"]}</td><td>{item["area"]}</td><td>{item["pub_date"]}</td></tr>'
+            )
+        pagination = ""
+        if page < self.pages:
+            pagination = f'<a class="next-page" href="?keyNo={condition_num}&page={page + 1}">下一页</a>'
+        return self.templates["list_order"].substitute(
+            condition_num=condition_num, rows="\n".join(rows), pagination=pagination
+        )
+
+    def detail(self, item_id):
+        """详情页，正文填充到指定大小"""
+        condition_num, page, index = (int(part) for part in item_id.split('_'))
+        item = self.item(condition_num, page, index)
+        repeat = max(1, self.detail_kb * 1024 // len(PARAGRAPH.encode('utf-8')))
+        paragraphs = "\n".join(f"        <p>{i + 1}. {PARAGRAPH}</p>" for i in range(repeat))
+        return self.templates["detail"].substitute(item, paragraphs=paragraphs)
+
+    def render(self, path, query):
+        """按路径返回页面内容，未知路径返回None"""
+        if path in ("/", "/index.html"):
+            return self.templates["home"].substitute()
+        if path == "/homePageUc.do":
+            return self.templates["member_center"].substitute()
+        if path == "/www/ucFocusCustomize/listOrder":
+            condition_num = int(query.get('keyNo', ['1'])[0])
+            page = int(query.get('page', ['1'])[0])
+            return self.list_order(condition_num, page)
+        if path.startswith("/detail/") and path.endswith(".html"):
+            return self.detail(path[len("/detail/"):-len(".html")])
+        return None
+
+
+def start_http_server(site):
+    """在后台线程启动样本站点，返回 (服务器, 根URL)"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            try:
+                body = site.render(parsed.path, parse_qs(parsed.query))
+            except (ValueError, KeyError):
+                body = None
+            if body is None:
+                self.send_error(404)
+                return
+            data = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def start_ftp_server(root, username, password):
+    """在后台线程启动本地FTP替身，返回 (服务器, 端口)"""
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.servers import ThreadedFTPServer
+
+    logging.getLogger('pyftpdlib').setLevel(logging.WARNING)
+    authorizer = DummyAuthorizer()
+    authorizer.add_user(username, password, str(root), perm='elradfmwMT')
+    handler = type('BenchFTPHandler', (FTPHandler,), {'authorizer': authorizer, 'banner': 'bench'})
+    server = ThreadedFTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, kwargs={'handle_exit': False}, daemon=True).start()
+    return server, server.address[1]
+
+
+class PeakRSSSampler:
+    """采样当前进程及其子进程（Chrome、ChromeDriver）的内存占用峰值"""
+
+    def __init__(self, interval=0.2):
+        """初始化采样器（未安装psutil时只统计当前进程）"""
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        try:
+            import psutil
+            self._process = psutil.Process()
+        except ImportError:
+            self._process = None
+
+    def _sample(self):
+        """当前进程树的RSS总和"""
+        total = self._process.memory_info().rss
+        for child in self._process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except Exception:
+                continue
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._sample())
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """开始采样"""
+        if self._process is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """停止采样，返回 (进程树峰值, 当前进程峰值)，单位字节"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        try:
+            import resource
+        except ImportError:
+            return (self.peak or None), None  # Windows下没有resource模块
+
+        # ru_maxrss在Linux下单位为KB，macOS下为字节
+        self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != 'darwin':
+            self_peak *= 1024
+        return (self.peak or None), self_peak
+
+
+def build_config(workdir, site_url, ftp_port, args):
+    """以项目配置为基础，改为指向本地站点和FTP替身"""
+    with open(PROJECT_ROOT / "config" / "settings.json", 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config['basic_config'].update({
+        'target_url': f"{site_url}/",
+        'base_url': site_url,
+        'requests_per_second': args.rps,
+        'max_concurrent_requests': args.workers
+    })
+    config['browser_config']['headless'] = True
+    config['browser_config']['driver_pool_size'] = args.drivers
+    config['session_config'].update({
+        'persist_cookies': False,
+        'user_data_dir': str(workdir / "data" / "chrome_profile")
+    })
+    config['member_center_config'].update({
+        'member_center_url': f"{site_url}/homePageUc.do",
+        'customize_url': f"{site_url}/www/ucFocusCustomize/listOrder",
+        'condition_url_template': f"{site_url}/www/ucFocusCustomize/listOrder?keyNo={{condition_num}}",
+        'conditions': list(range(1, args.conditions + 1)),
+        'max_conditions': args.conditions
+    })
+    config['data_config']['max_pages_per_search'] = args.pages
+    config['preflight_config']['cache_file'] = str(workdir / "logs" / "preflight_cache.json")
+    config['ftp_config'].update({
+        'enabled': not args.no_ftp,
+        'upload_mode': args.upload_mode,
+        'host': '127.0.0.1',
+        'port': ftp_port,
+        'username': 'bench',
+        'password': 'bench',
+        'remote_path': '/zhaobiao_info_filte/',
+        'web_base_url': 'http://127.0.0.1/zhaobiao_info_filte/'
+    })
+    return config
+
+
+def prepare_workdir(workdir, config):
+    """创建临时运行目录（驱动目录复用项目中的drivers，避免重复下载）"""
+    for name in ("config", "data", "logs"):
+        (workdir / name).mkdir(parents=True, exist_ok=True)
+    with open(workdir / "config" / "settings.json", 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=4)
+
+    drivers_dir = PROJECT_ROOT / "drivers"
+    if drivers_dir.exists():
+        shutil.copytree(drivers_dir, workdir / "drivers")
+
+
+def run_spider(workdir):
+    """在运行目录中执行完整的爬虫流程，返回 (是否成功, 指标报告)"""
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+    from zhaobiao_spider import ZhaobiaoSpider
+
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        spider = ZhaobiaoSpider()
+        success = spider.run()
+        return success, spider.metrics.report()
+    finally:
+        os.chdir(previous_cwd)
+
+
+def print_report(report):
+    """输出基准测试结果"""
+    print("\n" + "="*80)
+    print("📊 基准测试结果")
+    print("="*80)
+    print(f"⏱️  总耗时: {report['duration']:.2f}s")
+    print(f"📄 保存详情页: {report['items_saved']} 个，{report['items_per_second']:.2f} 条/秒")
+    if report['peak_rss_total']:
+        print(f"🧠 峰值内存(含浏览器): {report['peak_rss_total'] / 1024 / 1024:.1f} MB")
+    if report['peak_rss_self']:
+        print(f"🧠 峰值内存(Python进程): {report['peak_rss_self'] / 1024 / 1024:.1f} MB")
+    for name, amount in report['metrics']['bytes'].items():
+        print(f"💾 {name}: {amount / 1024:.1f} KB")
+
+    print(f"\n{'阶段':<28}{'次数':>6}{'失败':>6}{'总计(s)':>10}{'p50(s)':>10}{'p95(s)':>10}")
+    stages = sorted(report['metrics']['stages'].items(), key=lambda pair: pair[1]['total'], reverse=True)
+    for stage, stats in stages:
+        print(f"{stage:<30}{stats['count']:>6}{stats['failed']:>6}"
+              f"{stats['total']:>10.3f}{stats['p50']:>10.3f}{stats['p95']:>10.3f}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="招标信息爬虫离线性能基准测试")
+    parser.add_argument('--items', type=int, default=20, help="每页结果条数")
+    parser.add_argument('--pages', type=int, default=2, help="每个定制条件的结果页数")
+    parser.add_argument('--conditions', type=int, default=2, help="定制条件数量")
+    parser.add_argument('--detail-kb', type=int, default=40, help="详情页大小(KB)")
+    parser.add_argument('--workers', type=int, default=4, help="详情页并发数")
+    parser.add_argument('--drivers', type=int, default=1, help="浏览器数量")
+    parser.add_argument('--rps', type=float, default=0, help="每秒请求数上限（0为不限速）")
+    parser.add_argument('--upload-mode', choices=['immediate', 'sync'], default='immediate', help="上传方式")
+    parser.add_argument('--no-ftp', action='store_true', help="不上传")
+    parser.add_argument('--keep', action='store_true', help="保留临时运行目录")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="zhaobiao_bench_"))
+    ftp_root = workdir / "ftp_root"
+    ftp_root.mkdir()
+
+    site = FixtureSite(args.items, args.pages, args.detail_kb)
+    http_server, site_url = start_http_server(site)
+    ftp_server, ftp_port = start_ftp_server(ftp_root, 'bench', 'bench')
+    print(f"🌐 本地样本站点: {site_url}")
+    print(f"📡 本地FTP替身: 127.0.0.1:{ftp_port}")
+    print(f"📂 运行目录: {workdir}")
+
+    prepare_workdir(workdir, build_config(workdir, site_url, ftp_port, args))
+
+    sampler = PeakRSSSampler().start()
+    started = time.perf_counter()
+    try:
+        success, metrics = run_spider(workdir)
+    finally:
+        duration = time.perf_counter() - started
+        peak_total, peak_self = sampler.stop()
+        http_server.shutdown()
+        ftp_server.close_all()
+
+    items_saved = metrics['counters'].get('pages_saved', 0)
+    report = {
+        'started_at': metrics['started_at'],
+        'success': success,
+        'parameters': vars(args),
+        'duration': round(duration, 3),
+        'items_saved': items_saved,
+        'items_per_second': round(items_saved / duration, 3) if duration else 0,
+        'peak_rss_total': peak_total,
+        'peak_rss_self': peak_self,
+        'metrics': metrics
+    }
+    print_report(report)
+
+    report_path = PROJECT_ROOT / "logs" / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📈 基准测试报告已写入: {report_path}")
+
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
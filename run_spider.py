@@ -10,6 +10,7 @@ Date: 2025-06-09
 
 import sys
 import os
+import importlib.util
 from pathlib import Path
 
 # 添加src目录到Python路径
@@ -24,31 +25,18 @@ def check_environment():
         print("❌ Python版本过低，需要Python 3.7或更高版本")
         return False
     
-    # 检查必要的库
-    required_packages = [
-        'selenium',
-        'beautifulsoup4', 
-        'requests',
-        'webdriver_manager'
-    ]
+    # 检查必要的库（只查找模块，不实际导入）
+    required_packages = {
+        'selenium': 'selenium',
+        'beautifulsoup4': 'bs4',
+        'requests': 'requests',
+        'webdriver_manager': 'webdriver_manager'
+    }
     
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            if package == 'beautifulsoup4':
-                try:
-                    __import__('bs4')
-                except ImportError:
-                    missing_packages.append(package)
-            elif package == 'webdriver_manager':
-                try:
-                    __import__('webdriver_manager')
-                except ImportError:
-                    missing_packages.append(package)
-            else:
-                missing_packages.append(package)
+    missing_packages = [
+        package for package, module in required_packages.items()
+        if importlib.util.find_spec(module) is None
+    ]
     
     if missing_packages:
         print(f"❌ 缺少依赖包: {', '.join(missing_packages)}")
@@ -82,7 +70,11 @@ def main():
         from zhaobiao_spider import ZhaobiaoSpider
         
         spider = ZhaobiaoSpider()
-        success = spider.run()
+        if "--sync" in sys.argv:
+            # 只把本地已保存的页面增量同步到FTP
+            success = spider.run_sync()
+        else:
+            success = spider.run()
         
         if success:
             print("\n🎉 爬虫执行成功！")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+详情页全文检索入口
+在已保存的详情页中检索关键词，按相关度输出标题、链接和命中摘要
+
+用法: python search_pages.py 收单设备 [--limit 20] [--reindex]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from utils.page_search import PageSearchIndex
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="在已保存的招标详情页中全文检索")
+    parser.add_argument('query', nargs='*', help="检索词，多个词之间为“并且”关系")
+    parser.add_argument('--limit', type=int, default=20, help="最多返回的结果数")
+    parser.add_argument('--reindex', action='store_true', help="为尚未建立索引的已保存页面补建索引")
+    args = parser.parse_args()
+
+    with open("config/settings.json", 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    db_path = config['database_config']['sqlite_path']
+    if not args.reindex and not Path(db_path).exists():
+        print(f"❌ 数据库不存在: {db_path}")
+        return False
+
+    index = PageSearchIndex(db_path)
+    try:
+        if args.reindex:
+            count = index.reindex_saved()
+            print(f"✅ 已补建 {count} 个页面的全文索引")
+
+        query = ' '.join(args.query)
+        if not query:
+            return True
+
+        started = time.perf_counter()
+        results = index.search(query, limit=args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        print(f"🔍 “{query}” 共找到 {len(results)} 条结果 ({elapsed:.1f} ms)")
+        for number, result in enumerate(results, 1):
+            print(f"\n{number}. {result['title']}")
+            print(f"   📋 {result['info_type']} | 📍 {result['area']} | 📅 {result['pub_date']}")
+            print(f"   🔗 {result['link']}")
+            if result['local_path']:
+                print(f"   📂 {result['local_path']}")
+            print(f"   {result['snippet']}")
+        return True
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
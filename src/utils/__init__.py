@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+爬虫辅助工具模块
+"""
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多浏览器驱动池
+主浏览器登录一次后，把Cookie复制到其余浏览器，使多个定制条件可以并行处理
+"""
+
+import logging
+import queue
+from collections import defaultdict
+
+
+def add_cookies(driver, cookies):
+    """把Cookie列表写入浏览器（按域名分组，先打开对应域名再写入），返回写入的数量"""
+    cookies_by_domain = defaultdict(list)
+    for cookie in cookies:
+        domain = (cookie.get('domain') or '').lstrip('.')
+        cookies_by_domain[domain].append(cookie)
+
+    added = 0
+    for domain, domain_cookies in cookies_by_domain.items():
+        if not domain:
+            continue
+        # 添加Cookie前必须先打开对应域名下的页面
+        driver.get(f"https://{domain}/")
+        for cookie in domain_cookies:
+            cookie = dict(cookie)
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+                cookie.pop('sameSite', None)
+            try:
+                driver.add_cookie(cookie)
+                added += 1
+            except Exception:
+                continue
+    return added
+
+
+def copy_session_cookies(source_driver, target_driver):
+    """把源浏览器的Cookie复制到目标浏览器，返回复制的数量"""
+    return add_cookies(target_driver, source_driver.get_cookies())
+
+
+class DriverPool:
+    """浏览器驱动池：包含已登录的主浏览器和共享其会话的附加浏览器"""
+
+    def __init__(self, primary_driver, driver_factory, size=1, logger=None):
+        """
+        初始化驱动池
+
+        driver_factory() 创建并返回一个新的WebDriver实例
+        """
+        self.primary_driver = primary_driver
+        self.driver_factory = driver_factory
+        self.size = max(1, int(size))
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        self.extra_drivers = []
+
+    def start(self):
+        """创建附加浏览器并复制登录会话，返回池中所有浏览器"""
+        for i in range(self.size - 1):
+            try:
+                driver = self.driver_factory()
+            except Exception as e:
+                print(f"⚠️  附加浏览器{i + 1}创建失败: {e}")
+                self.logger.warning(f"附加浏览器创建失败: {e}")
+                break
+
+            copied = copy_session_cookies(self.primary_driver, driver)
+            self.extra_drivers.append(driver)
+            print(f"✅ 附加浏览器{i + 1}已就绪 (复制 {copied} 个Cookie)")
+
+        return [self.primary_driver] + self.extra_drivers
+
+    def close(self):
+        """关闭附加浏览器（主浏览器由调用方负责关闭）"""
+        for driver in self.extra_drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.extra_drivers = []
+
+
+class WorkerQueue:
+    """空闲工作者队列：并行任务从中借用工作者，完成后归还"""
+
+    def __init__(self, workers):
+        """初始化队列"""
+        self._queue = queue.Queue()
+        for worker in workers:
+            self._queue.put(worker)
+
+    def run(self, func, *args):
+        """借用一个工作者执行func(worker, *args)"""
+        worker = self._queue.get()
+        try:
+            return func(worker, *args)
+        finally:
+            self._queue.put(worker)
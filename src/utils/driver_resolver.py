@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ChromeDriver路径解析
+跨平台检测Chrome版本，并把Chrome版本、对应驱动路径及其校验和缓存到本地清单文件，
+只有Chrome版本变化时才需要联网获取驱动，缓存建立后可完全离线使用
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+
+MANIFEST_NAME = "driver_manifest.json"
+
+VERSION_RE = re.compile(r'\d+(?:\.\d+)+')
+
+# 各平台常见的Chrome安装位置
+CHROME_CANDIDATES = {
+    'win': [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe")
+    ],
+    'mac': [
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "/Applications/Chromium.app/Contents/MacOS/Chromium"
+    ],
+    'linux': [
+        "google-chrome", "google-chrome-stable", "chromium", "chromium-browser"
+    ]
+}
+
+
+def platform_family():
+    """返回 win/mac/linux"""
+    if sys.platform.startswith('win'):
+        return 'win'
+    if sys.platform == 'darwin':
+        return 'mac'
+    return 'linux'
+
+
+def chrome_for_testing_platform():
+    """返回Chrome for Testing下载使用的平台标识"""
+    family = platform_family()
+    if family == 'win':
+        return 'win64' if sys.maxsize > 2 ** 32 else 'win32'
+    if family == 'mac':
+        return 'mac-arm64' if platform.machine() == 'arm64' else 'mac-x64'
+    return 'linux64'
+
+
+def driver_filename():
+    """当前平台的ChromeDriver文件名"""
+    return 'chromedriver.exe' if platform_family() == 'win' else 'chromedriver'
+
+
+def file_sha256(path):
+    """计算文件的SHA-256校验和"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_chrome_binary():
+    """查找Chrome可执行文件路径"""
+    for candidate in CHROME_CANDIDATES[platform_family()]:
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def _registry_chrome_version():
+    """Windows下从注册表读取Chrome版本"""
+    try:
+        import winreg
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+        version = winreg.QueryValueEx(key, "version")[0]
+        winreg.CloseKey(key)
+        return version
+    except (ImportError, OSError):
+        return None
+
+
+def _binary_chrome_version(chrome_path):
+    """通过 chrome --version 获取版本"""
+    try:
+        result = subprocess.run([chrome_path, "--version"], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip().split()[-1]
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return None
+
+
+def _binary_driver_version(driver_path):
+    """通过 chromedriver --version 获取驱动版本（输出形如 ChromeDriver 121.0.6167.85 (...)）"""
+    try:
+        result = subprocess.run([str(driver_path), "--version"], capture_output=True, text=True, timeout=10)
+        match = VERSION_RE.search(result.stdout) if result.returncode == 0 else None
+        if match:
+            return match.group(0)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return None
+
+
+def major_version(version):
+    """取版本号的主版本部分"""
+    return version.split('.')[0] if version else None
+
+
+class DriverResolver:
+    """带本地清单缓存的ChromeDriver解析器"""
+
+    def __init__(self, drivers_dir="drivers", logger=None):
+        """初始化解析器"""
+        self.drivers_dir = Path(drivers_dir)
+        self.manifest_path = self.drivers_dir / MANIFEST_NAME
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self):
+        """读取缓存清单"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self):
+        """写入缓存清单"""
+        self.drivers_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+    def local_driver_path(self):
+        """drivers目录下当前平台的驱动路径"""
+        return self.drivers_dir / driver_filename()
+
+    def chrome_version(self):
+        """
+        获取Chrome版本
+
+        Chrome可执行文件未变化（路径、大小、修改时间一致）时直接使用缓存的版本，不启动子进程
+        """
+        chrome_path = find_chrome_binary()
+        if chrome_path:
+            stat = os.stat(chrome_path)
+            fingerprint = [chrome_path, stat.st_size, int(stat.st_mtime)]
+            if self.manifest.get('chrome_fingerprint') == fingerprint and self.manifest.get('chrome_version'):
+                return self.manifest['chrome_version']
+        else:
+            fingerprint = None
+
+        version = _registry_chrome_version() if platform_family() == 'win' else None
+        if not version and chrome_path:
+            version = _binary_chrome_version(chrome_path)
+
+        if version:
+            self.manifest['chrome_fingerprint'] = fingerprint
+            self.manifest['chrome_version'] = version
+            self.save_manifest()
+        return version
+
+    def driver_version(self, driver_path):
+        """
+        获取驱动版本
+
+        驱动文件未变化（大小、修改时间一致）时直接使用缓存的版本，不启动子进程
+        """
+        stat = os.stat(driver_path)
+        fingerprint = [stat.st_size, int(stat.st_mtime)]
+        versions = self.manifest.setdefault('driver_versions', {})
+        cached = versions.get(str(driver_path))
+        if cached and cached.get('stat') == fingerprint:
+            return cached.get('version')
+
+        version = _binary_driver_version(driver_path)
+        versions[str(driver_path)] = {'stat': fingerprint, 'version': version}
+        self.save_manifest()
+        return version
+
+    def cached_driver(self, chrome_version):
+        """清单中记录的驱动仍然有效时返回其路径"""
+        driver_path = self.manifest.get('driver_path')
+        if not driver_path or not os.path.exists(driver_path):
+            return None
+        if chrome_version and self.manifest.get('driver_major') != major_version(chrome_version):
+            return None
+
+        # 大小和修改时间未变时信任缓存的校验和，否则重新校验
+        stat = os.stat(driver_path)
+        if self.manifest.get('driver_stat') != [stat.st_size, int(stat.st_mtime)]:
+            if file_sha256(driver_path) != self.manifest.get('driver_sha256'):
+                return None
+            self.manifest['driver_stat'] = [stat.st_size, int(stat.st_mtime)]
+            self.save_manifest()
+        return driver_path
+
+    def record_driver(self, driver_path, driver_version):
+        """把驱动信息写入清单"""
+        stat = os.stat(driver_path)
+        self.manifest.update({
+            'platform': chrome_for_testing_platform(),
+            'driver_path': str(driver_path),
+            'driver_major': major_version(driver_version),
+            'driver_sha256': file_sha256(driver_path),
+            'driver_stat': [stat.st_size, int(stat.st_mtime)]
+        })
+        self.save_manifest()
+
+    def resolve(self, allow_download=True):
+        """
+        返回可用的ChromeDriver路径
+
+        依次使用：清单缓存 -> drivers目录下与Chrome主版本一致的驱动 -> webdriver_manager下载（需联网）
+        """
+        chrome_version = self.chrome_version()
+
+        driver_path = self.cached_driver(chrome_version)
+        if driver_path:
+            return driver_path
+
+        local_path = self.local_driver_path()
+        if local_path.exists():
+            local_version = self.driver_version(local_path)
+            if not chrome_version or major_version(local_version) == major_version(chrome_version):
+                self.record_driver(local_path, local_version or chrome_version)
+                return str(local_path)
+            self.logger.warning(f"本地ChromeDriver版本 {local_version} 与Chrome {chrome_version} 不匹配，忽略: {local_path}")
+
+        if not allow_download:
+            return None
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+        self.record_driver(driver_path, self.driver_version(driver_path) or chrome_version)
+        self.logger.info(f"已下载ChromeDriver: {driver_path} (Chrome {chrome_version})")
+        return driver_path
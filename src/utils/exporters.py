@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结构化数据导出
+按data_config.output_formats把提取到的每条招标信息增量写出：
+CSV和JSON Lines按天追加，Excel使用openpyxl的只写（流式）模式，内存占用不随数据量增长
+同一链接只导出一次：追加前读取当天文件中已有的链接，本次运行内重复出现的链接也会跳过
+"""
+
+import csv
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+# 导出字段（顺序即CSV/Excel列顺序）
+EXPORT_FIELDS = [
+    'condition_num', 'page', 'index', 'title', 'info_type', 'area',
+    'pub_date', 'categories', 'matched_keywords', 'link', 'extracted_time'
+]
+
+
+class CsvExporter:
+    """追加写入的CSV导出"""
+
+    def __init__(self, path, fields):
+        """打开文件，新文件写入表头"""
+        is_new = not path.exists() or path.stat().st_size == 0
+        # utf-8-sig便于Excel直接打开中文CSV，追加时不会重复写入BOM
+        self.file = open(path, 'a', encoding='utf-8-sig', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=fields, extrasaction='ignore')
+        if is_new:
+            self.writer.writeheader()
+        self.path = path
+
+    def existing_links(self):
+        """文件中已导出的链接"""
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            return {row.get('link') for row in csv.DictReader(f)} - {None, ''}
+
+    def write(self, row):
+        """写入一行"""
+        self.writer.writerow(row)
+
+    def flush(self):
+        """刷新到磁盘"""
+        self.file.flush()
+
+    def close(self):
+        """关闭文件"""
+        self.file.close()
+
+
+class JsonLinesExporter:
+    """追加写入的JSON Lines导出"""
+
+    def __init__(self, path, fields):
+        """打开文件"""
+        self.fields = fields
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def existing_links(self):
+        """文件中已导出的链接（跳过中断时写了一半的行）"""
+        links = set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    links.add(json.loads(line).get('link'))
+                except ValueError:
+                    continue
+        return links - {None, ''}
+
+    def write(self, row):
+        """写入一行"""
+        record = {field: row.get(field) for field in self.fields}
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def flush(self):
+        """刷新到磁盘"""
+        self.file.flush()
+
+    def close(self):
+        """关闭文件"""
+        self.file.close()
+
+
+class ExcelExporter:
+    """流式写入的Excel导出（每次运行一个工作簿）"""
+
+    def __init__(self, path, fields):
+        """创建只写模式的工作簿"""
+        from openpyxl import Workbook
+
+        self.path = path
+        self.fields = fields
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('招标信息')
+        self.sheet.append(fields)
+
+    def existing_links(self):
+        """每次运行新建工作簿，没有已导出的链接"""
+        return set()
+
+    def write(self, row):
+        """写入一行"""
+        self.sheet.append([row.get(field) for field in self.fields])
+
+    def flush(self):
+        """只写模式的行已写入临时文件，无需额外操作"""
+
+    def close(self):
+        """保存工作簿"""
+        self.workbook.save(self.path)
+
+
+class ItemExporter:
+    """多格式导出管理"""
+
+    def __init__(self, output_dir, formats, logger=None):
+        """按配置的格式打开各导出器"""
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        self.fields = list(EXPORT_FIELDS)
+        self.count = 0
+        self.exported_links = set()
+        self._lock = threading.Lock()
+        self.exporters = {}
+
+        day = datetime.now().strftime('%Y%m%d')
+        run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        targets = {
+            'csv': (CsvExporter, self.output_dir / f"tenders_{day}.csv"),
+            'json': (JsonLinesExporter, self.output_dir / f"tenders_{day}.jsonl"),
+            'jsonl': (JsonLinesExporter, self.output_dir / f"tenders_{day}.jsonl"),
+            'excel': (ExcelExporter, self.output_dir / f"tenders_{run_stamp}.xlsx")
+        }
+
+        for fmt in formats:
+            if fmt not in targets:
+                self.logger.warning(f"不支持的导出格式: {fmt}")
+                continue
+            exporter_cls, path = targets[fmt]
+            if any(existing_path == path for _, existing_path in self.exporters.values()):
+                continue  # json与jsonl共用同一个文件
+            try:
+                exporter = exporter_cls(path, self.fields)
+                self.exporters[fmt] = (exporter, path)
+                self.exported_links |= exporter.existing_links()
+            except ImportError as e:
+                print(f"⚠️  {fmt}导出不可用（缺少依赖: {e.name}），已跳过")
+                self.logger.warning(f"{fmt}导出不可用: {e}")
+
+    @property
+    def paths(self):
+        """各格式的输出文件路径"""
+        return {fmt: path for fmt, (_, path) in self.exporters.items()}
+
+    def write_items(self, items, **extra):
+        """
+        写出一批项目（extra中的字段会合并到每一行）
+
+        已导出过的链接跳过，返回实际写出的行数
+        """
+        written = 0
+        with self._lock:
+            for item in items:
+                link = item.get('link')
+                if link in self.exported_links:
+                    continue
+                if link:
+                    self.exported_links.add(link)
+                row = {**item, **extra}
+                for exporter, _ in self.exporters.values():
+                    exporter.write(row)
+                self.count += 1
+                written += 1
+            for exporter, _ in self.exporters.values():
+                exporter.flush()
+        return written
+
+    def close(self):
+        """关闭所有导出器"""
+        with self._lock:
+            for fmt, (exporter, path) in self.exporters.items():
+                try:
+                    exporter.close()
+                except Exception as e:
+                    self.logger.error(f"{fmt}导出文件关闭失败: {path}: {e}")
+            self.exporters = {}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FTP长连接会话池
+在整个运行过程中复用已登录的FTP连接，避免每个文件都重新连接、登录和切换目录
+"""
+
+import ftplib
+import logging
+import posixpath
+import queue
+import threading
+from contextlib import contextmanager
+
+
+# 连接级错误：出现时丢弃该连接，下次借用时重新建立
+CONNECTION_ERRORS = (OSError, EOFError, ftplib.error_temp, ftplib.error_proto)
+
+# 本地文件错误（如待上传文件不存在或无权限读取）与连接无关，不应丢弃连接或重试
+LOCAL_FILE_ERRORS = (FileNotFoundError, PermissionError, IsADirectoryError, NotADirectoryError)
+
+
+class FTPSessionPool:
+    """FTP会话池：保持已认证连接，NOOP保活，断线重连，缓存已创建的远程目录"""
+
+    def __init__(self, ftp_config, size=1, timeout=30, logger=None):
+        """初始化会话池"""
+        self.ftp_config = ftp_config
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._known_dirs = set()
+        self._closed = False
+
+    def _connect(self, connect_timeout=None):
+        """建立并登录一个新的FTP连接（connect_timeout只用于建立连接和登录）"""
+        ftp = ftplib.FTP()
+        ftp.connect(self.ftp_config['host'], self.ftp_config['port'], timeout=connect_timeout or self.timeout)
+        ftp.login(self.ftp_config['username'], self.ftp_config['password'])
+        if connect_timeout and connect_timeout != self.timeout:
+            # 之后的传输使用常规超时
+            ftp.timeout = self.timeout
+            ftp.sock.settimeout(self.timeout)
+        self.logger.info(f"FTP连接已建立: {self.ftp_config['host']}")
+        return ftp
+
+    @staticmethod
+    def _is_alive(ftp):
+        """通过NOOP检查连接是否仍然可用"""
+        try:
+            ftp.voidcmd('NOOP')
+            return True
+        except ftplib.all_errors:
+            return False
+
+    @staticmethod
+    def _close_quietly(ftp):
+        """关闭连接，忽略所有错误"""
+        try:
+            ftp.quit()
+        except ftplib.all_errors:
+            try:
+                ftp.close()
+            except Exception:
+                pass
+
+    def _acquire(self, connect_timeout=None):
+        """获取一个可用连接，必要时新建或重连"""
+        if self._closed:
+            raise RuntimeError("FTP会话池已关闭")
+
+        try:
+            ftp = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._connect(connect_timeout)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            # 连接数已达上限，等待其他线程归还
+            ftp = self._idle.get()
+
+        if self._is_alive(ftp):
+            return ftp
+
+        # 连接已断开，原地重连（占用的名额不变）
+        self.logger.warning("FTP连接已断开，正在重连...")
+        self._close_quietly(ftp)
+        try:
+            return self._connect(connect_timeout)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _release(self, ftp):
+        """归还连接到空闲队列"""
+        if self._closed:
+            self._close_quietly(ftp)
+            with self._lock:
+                self._created -= 1
+        else:
+            self._idle.put(ftp)
+
+    def _discard(self, ftp):
+        """丢弃出错的连接"""
+        self._close_quietly(ftp)
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def session(self, connect_timeout=None):
+        """借用一个已登录的连接，使用完毕自动归还"""
+        ftp = self._acquire(connect_timeout)
+        try:
+            yield ftp
+        except LOCAL_FILE_ERRORS:
+            raise
+        except CONNECTION_ERRORS:
+            self._discard(ftp)
+            ftp = None
+            raise
+        finally:
+            if ftp is not None:
+                self._release(ftp)
+
+    def ensure_dir(self, ftp, remote_dir):
+        """确保远程目录存在（结果缓存，同一目录只检查一次）"""
+        if remote_dir in self._known_dirs:
+            return True
+
+        try:
+            ftp.cwd(remote_dir)
+        except ftplib.error_perm:
+            # 目录不存在，逐级创建
+            path = '/' if remote_dir.startswith('/') else ''
+            for part in [p for p in remote_dir.split('/') if p]:
+                path = posixpath.join(path, part)
+                try:
+                    ftp.mkd(path)
+                except ftplib.error_perm:
+                    pass
+            try:
+                ftp.cwd(remote_dir)
+            except ftplib.error_perm:
+                print(f"⚠️  无法创建目录: {remote_dir}")
+                return False
+
+        with self._lock:
+            self._known_dirs.add(remote_dir)
+        return True
+
+    def upload(self, local_path, filename, remote_dir=None, retries=1):
+        """上传单个文件，连接中断时自动重连重试"""
+        remote_dir = remote_dir or self.ftp_config['remote_path']
+        remote_file = posixpath.join(remote_dir, filename)
+
+        # 先打开本地文件：文件本身有问题时不占用连接，也不重试
+        with open(local_path, 'rb') as f:
+            for attempt in range(retries + 1):
+                try:
+                    with self.session() as ftp:
+                        self.ensure_dir(ftp, remote_dir)
+                        f.seek(0)
+                        ftp.storbinary(f'STOR {remote_file}', f)
+                    return remote_file
+                except CONNECTION_ERRORS as e:
+                    if attempt >= retries:
+                        raise
+                    self.logger.warning(f"FTP上传中断，准备重试: {e}")
+
+    def check(self, connect_timeout=10):
+        """检查能否登录（与原自检一样10秒连接超时；连接保留在池中供后续上传复用）"""
+        with self.session(connect_timeout) as ftp:
+            ftp.voidcmd('NOOP')
+        return True
+
+    def close(self):
+        """关闭所有空闲连接"""
+        self._closed = True
+        while True:
+            try:
+                ftp = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_quietly(ftp)
+            with self._lock:
+                self._created -= 1
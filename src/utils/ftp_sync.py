@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于清单的FTP增量同步
+对比本地保存目录与服务器上的清单文件（及MLSD/SIZE得到的远程文件大小），
+在一个会话中只上传新增或变化的文件，中断的传输通过REST断点续传
+"""
+
+import ftplib
+import hashlib
+import io
+import json
+import logging
+import posixpath
+from pathlib import Path
+
+
+REMOTE_MANIFEST_NAME = ".sync_manifest.json"
+LOCAL_STATE_NAME = ".sync_state.json"
+LOCAL_PENDING_NAME = ".sync_pending.json"
+
+# 每上传多少个文件保存一次远程清单（结束时总会保存）
+MANIFEST_SAVE_INTERVAL = 50
+
+# 服务器不支持某条命令时可能返回的错误
+UNSUPPORTED_ERRORS = (ftplib.error_perm, ftplib.error_temp, ftplib.error_reply)
+
+
+def _file_sha256(path):
+    """计算文件的SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FTPSync:
+    """本地目录到FTP目录的增量同步"""
+
+    def __init__(self, ftp_pool, logger=None):
+        """使用已有的FTP会话池"""
+        self.ftp_pool = ftp_pool
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+    def _local_files(self, local_dir, pattern):
+        """
+        列出本地文件及其哈希
+
+        哈希按 (大小, 修改时间) 缓存在本地状态文件中，未变化的文件不重复计算
+        """
+        state_path = local_dir / LOCAL_STATE_NAME
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+
+        files = {}
+        new_state = {}
+        for path in sorted(local_dir.glob(pattern)):
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            cached = state.get(path.name)
+            if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                sha256 = cached[2]
+            else:
+                sha256 = _file_sha256(path)
+            new_state[path.name] = [stat.st_size, stat.st_mtime_ns, sha256]
+            files[path.name] = {'path': path, 'size': stat.st_size, 'sha256': sha256}
+
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump(new_state, f)
+        return files
+
+    @staticmethod
+    def _load_pending(local_dir):
+        """读取本地记录的未完成上传 {文件名: {'remote': 远程路径, 'sha256': 哈希}}"""
+        try:
+            with open(local_dir / LOCAL_PENDING_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_pending(local_dir, pending):
+        """写入未完成上传记录"""
+        with open(local_dir / LOCAL_PENDING_NAME, 'w', encoding='utf-8') as f:
+            json.dump(pending, f, ensure_ascii=False)
+
+    @staticmethod
+    def _remote_sizes(ftp, remote_dir):
+        """获取远程目录中的文件大小（优先MLSD，不支持时逐个SIZE）"""
+        sizes = {}
+        try:
+            for name, facts in ftp.mlsd(remote_dir, facts=['type', 'size']):
+                if facts.get('type') == 'file' and 'size' in facts:
+                    sizes[name] = int(facts['size'])
+            return sizes
+        except UNSUPPORTED_ERRORS:
+            pass
+
+        ftp.voidcmd('TYPE I')
+        for entry in ftp.nlst(remote_dir):
+            name = posixpath.basename(entry)
+            try:
+                sizes[name] = ftp.size(posixpath.join(remote_dir, name))
+            except UNSUPPORTED_ERRORS:
+                continue
+        return sizes
+
+    @staticmethod
+    def _load_remote_manifest(ftp, remote_dir):
+        """读取服务器上的同步清单"""
+        buffer = io.BytesIO()
+        try:
+            ftp.retrbinary(f"RETR {posixpath.join(remote_dir, REMOTE_MANIFEST_NAME)}", buffer.write)
+            return json.loads(buffer.getvalue().decode('utf-8'))
+        except (ftplib.error_perm, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_remote_manifest(ftp, remote_dir, manifest):
+        """写入服务器上的同步清单"""
+        data = json.dumps(manifest, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        ftp.storbinary(f"STOR {posixpath.join(remote_dir, REMOTE_MANIFEST_NAME)}", io.BytesIO(data))
+
+    @staticmethod
+    def _upload(ftp, local_path, remote_file, offset=0):
+        """上传文件，offset>0时从断点续传"""
+        with open(local_path, 'rb') as f:
+            if offset:
+                f.seek(offset)
+                ftp.storbinary(f"STOR {remote_file}", f, rest=offset)
+            else:
+                ftp.storbinary(f"STOR {remote_file}", f)
+
+    def sync(self, local_dir, remote_dir, pattern="*.html", on_uploaded=None):
+        """
+        同步本地目录到远程目录
+
+        on_uploaded(local_path, filename) 在每个文件上传成功后回调；
+        返回统计 {'uploaded', 'resumed', 'skipped', 'failed'}
+        """
+        local_dir = Path(local_dir)
+        summary = {'uploaded': 0, 'resumed': 0, 'skipped': 0, 'failed': 0}
+        local_files = self._local_files(local_dir, pattern)
+        pending = self._load_pending(local_dir)
+
+        with self.ftp_pool.session() as ftp:
+            self.ftp_pool.ensure_dir(ftp, remote_dir)
+            manifest = self._load_remote_manifest(ftp, remote_dir)
+            remote_sizes = self._remote_sizes(ftp, remote_dir)
+
+            unsaved = 0
+            try:
+                for name, info in local_files.items():
+                    remote_size = remote_sizes.get(name)
+                    recorded = manifest.get(name, {})
+                    remote_file = posixpath.join(remote_dir, name)
+
+                    # 清单记录的哈希一致且远程文件完整：无需上传
+                    if recorded.get('sha256') == info['sha256'] and remote_size == info['size']:
+                        summary['skipped'] += 1
+                        continue
+
+                    # 只有本地记录了同一内容到同一路径的未完成上传时，远程文件才确定是本文件的前缀，可以断点续传；
+                    # 其他情况（如即时上传模式留下的旧版本）一律完整上传
+                    offset = 0
+                    started = pending.get(name, {})
+                    if (started.get('remote') == remote_file and started.get('sha256') == info['sha256']
+                            and remote_size is not None and 0 < remote_size < info['size']):
+                        offset = remote_size
+                    else:
+                        # 开始传输前在本地记录，中断后下次同步据此续传
+                        pending[name] = {'remote': remote_file, 'sha256': info['sha256']}
+                        self._save_pending(local_dir, pending)
+
+                    try:
+                        try:
+                            self._upload(ftp, info['path'], remote_file, offset)
+                        except UNSUPPORTED_ERRORS:
+                            if not offset:
+                                raise
+                            # 服务器不支持REST，改为完整上传
+                            offset = 0
+                            self._upload(ftp, info['path'], remote_file)
+                    except ftplib.error_perm as e:
+                        summary['failed'] += 1
+                        self.logger.error(f"同步上传失败: {name}: {e}")
+                        continue
+
+                    manifest[name] = {'size': info['size'], 'sha256': info['sha256']}
+                    pending.pop(name, None)
+                    self._save_pending(local_dir, pending)
+                    summary['resumed' if offset else 'uploaded'] += 1
+                    if on_uploaded:
+                        on_uploaded(info['path'], name)
+
+                    # 定期保存清单，长时间同步中断时不必从头比对
+                    unsaved += 1
+                    if unsaved >= MANIFEST_SAVE_INTERVAL:
+                        self._save_remote_manifest(ftp, remote_dir, manifest)
+                        unsaved = 0
+            finally:
+                # 即使中途断开，也尽量保存已完成部分的清单
+                try:
+                    self._save_remote_manifest(ftp, remote_dir, manifest)
+                except ftplib.all_errors as e:
+                    self.logger.warning(f"同步清单保存失败: {e}")
+
+        return summary
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+详情页流式标注
+只定位<head>结束和<body>开始两个插入点，把原始内容与注入片段直接拼接写入磁盘，
+不再构建完整的BeautifulSoup文档树
+"""
+
+import re
+from html import escape
+
+
+HEAD_CLOSE_RE = re.compile(r'</head\s*>', re.IGNORECASE)
+BODY_OPEN_RE = re.compile(r'<body\b[^>]*>', re.IGNORECASE)
+
+# 项目信息展示区样式（与原BeautifulSoup版本输出一致）
+INFO_HEADER_STYLE = """
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    padding: 20px;
+                    margin: 0 0 20px 0;
+                    border-radius: 8px;
+                    box-shadow: 0 4px 10px rgba(0,0,0,0.1);
+                    font-family: 'Microsoft YaHei', Arial, sans-serif;
+                """
+TITLE_STYLE = "margin: 0 0 15px 0; font-size: 20px;"
+DETAILS_STYLE = "display: flex; flex-wrap: wrap; gap: 15px;"
+DETAIL_ITEM_STYLE = "background: rgba(255,255,255,0.1); padding: 8px 12px; border-radius: 4px;"
+LINK_STYLE = "color: #ffeb3b;"
+
+
+def _attr(value):
+    """转义属性值（属性统一使用双引号）"""
+    return escape(str(value), quote=False).replace('"', '&quot;')
+
+
+def _text(value):
+    """转义文本内容"""
+    return escape(str(value), quote=False)
+
+
+def render_meta_tags(meta_tags):
+    """把 (name, content) 列表渲染为meta标签片段"""
+    return ''.join(
+        f'<meta name="{_attr(name)}" content="{_attr(content)}"/>'
+        for name, content in meta_tags
+    )
+
+
+def render_info_header(title, details):
+    """
+    渲染页面顶部的项目信息展示区
+
+    details为 (标签, 值, 链接) 列表，链接不为None时该项渲染为超链接
+    """
+    parts = [
+        f'<div style="{_attr(INFO_HEADER_STYLE)}"><div>',
+        f'<h2 style="{TITLE_STYLE}">📋 {_text(title)}</h2>',
+        f'<div style="{DETAILS_STYLE}">'
+    ]
+
+    for label, value, href in details:
+        if href is None:
+            parts.append(f'<div style="{DETAIL_ITEM_STYLE}">{_text(label)}: {_text(value)}</div>')
+        else:
+            parts.append(
+                f'<div style="{DETAIL_ITEM_STYLE}"><strong>{_text(label)}:</strong> '
+                f'<a href="{_attr(href)}" target="_blank" style="{LINK_STYLE}">{_text(value)}</a></div>'
+            )
+
+    parts.append('</div></div></div>')
+    return ''.join(parts)
+
+
+def find_insertion_points(page_source):
+    """返回 (head结束位置, body开始标签结束位置)，不存在时为None"""
+    head_match = HEAD_CLOSE_RE.search(page_source)
+    body_match = BODY_OPEN_RE.search(page_source)
+    return (
+        head_match.start() if head_match else None,
+        body_match.end() if body_match else None
+    )
+
+
+def write_annotated(page_source, file_path, head_fragment, body_fragment):
+    """把原始页面和注入片段按插入点顺序写入文件，返回写入的字符数"""
+    head_pos, body_pos = find_insertion_points(page_source)
+
+    inserts = []
+    if head_pos is not None and head_fragment:
+        inserts.append((head_pos, head_fragment))
+    if body_pos is not None and body_fragment:
+        inserts.append((body_pos, body_fragment))
+    inserts.sort(key=lambda insert: insert[0])
+
+    written = 0
+    cursor = 0
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for position, fragment in inserts:
+            written += f.write(page_source[cursor:position])
+            written += f.write(fragment)
+            cursor = position
+        written += f.write(page_source[cursor:])
+    return written
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+免浏览器详情页抓取
+登录成功后把Selenium中的Cookie导出到requests.Session，
+通过长连接直接抓取静态详情页，只有需要JavaScript渲染的页面才回退到浏览器
+"""
+
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class DetailPageFetcher:
+    """基于requests.Session的详情页抓取器"""
+
+    def __init__(self, fetch_config, logger=None):
+        """初始化抓取器"""
+        self.fetch_config = fetch_config
+        self.timeout = fetch_config.get('timeout', 15)
+        self.min_content_length = fetch_config.get('min_content_length', 2000)
+        self.js_required_markers = fetch_config.get('js_required_markers', [])
+        self.login_markers = fetch_config.get('login_markers', [])
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        self._forks = []
+
+        self.session = requests.Session()
+        pool_size = fetch_config.get('pool_size', 10)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=fetch_config.get('max_retries', 1)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def load_driver_session(self, driver):
+        """从WebDriver导出Cookie和User-Agent"""
+        cookies = driver.get_cookies()
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain'),
+                path=cookie.get('path', '/'),
+                secure=cookie.get('secure', False)
+            )
+
+        user_agent = driver.execute_script("return navigator.userAgent;")
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'zh-CN,zh;q=0.9',
+            'Connection': 'keep-alive'
+        })
+        self.logger.info(f"已导出浏览器会话: {len(cookies)} 个Cookie")
+        return len(cookies)
+
+    def fork(self):
+        """
+        创建使用独立Session（独立的Cookie和连接池）的抓取器，复制当前的Cookie和请求头
+
+        requests.Session不保证线程安全，并行处理定制条件时每个工作副本各用一个；
+        派生的抓取器随本抓取器一起关闭
+        """
+        fetcher = DetailPageFetcher(self.fetch_config, logger=self.logger)
+        fetcher.session.cookies.update(self.session.cookies)
+        fetcher.session.headers.update(self.session.headers)
+        self._forks.append(fetcher)
+        return fetcher
+
+    def needs_browser(self, response, html):
+        """判断页面是否需要浏览器渲染（或会话已失效）"""
+        if response.status_code != 200:
+            return True
+        if 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return True
+        if len(html) < self.min_content_length:
+            return True
+        if any(marker in html for marker in self.login_markers):
+            return True
+        if any(marker in html for marker in self.js_required_markers):
+            return True
+        return False
+
+    def fetch(self, url, referer=None):
+        """
+        通过HTTP抓取详情页
+
+        成功返回HTML文本；需要回退到浏览器时返回None
+        """
+        try:
+            headers = {'Referer': referer} if referer else None
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+            # 服务器未声明编码时按内容推断，避免中文乱码
+            if not response.encoding or response.encoding.lower() == 'iso-8859-1':
+                response.encoding = response.apparent_encoding
+            html = response.text
+
+            if self.needs_browser(response, html):
+                self.logger.info(f"详情页需要浏览器渲染: {url}")
+                return None
+            return html
+
+        except requests.RequestException as e:
+            self.logger.warning(f"HTTP抓取失败，回退到浏览器: {url}: {e}")
+            return None
+
+    def close(self):
+        """关闭会话连接池"""
+        for fetcher in self._forks:
+            fetcher.close()
+        self._forks = []
+        self.session.close()
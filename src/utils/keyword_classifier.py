@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多关键词分类
+把配置中各分类的关键词编译为一个Aho-Corasick自动机，
+对标题（以及可选的详情页正文）做一次线性扫描即可得到全部命中的关键词和分类，
+耗时与关键词数量无关
+"""
+
+from collections import deque
+
+
+# 多个分类/关键词在导出和meta中的分隔符
+SEPARATOR = ";"
+
+
+class KeywordClassifier:
+    """基于Aho-Corasick自动机的关键词分类器"""
+
+    def __init__(self, categories):
+        """
+        编译自动机
+
+        categories为 {分类名: [关键词, ...]}，同一关键词可属于多个分类；匹配不区分大小写
+        """
+        self.categories = list(categories)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        keyword_categories = {}
+        self._display = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                normalized = keyword.strip().lower()
+                if normalized:
+                    keyword_categories.setdefault(normalized, []).append(category)
+                    self._display.setdefault(normalized, keyword.strip())
+
+        for keyword in keyword_categories:
+            self._insert(keyword)
+        self._build_fail_links()
+        self._keyword_categories = keyword_categories
+
+    def __len__(self):
+        """关键词数量"""
+        return len(self._keyword_categories)
+
+    def _insert(self, keyword):
+        """把关键词加入字典树"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = (keyword,)
+
+    def _build_fail_links(self):
+        """按层序构建失败指针，并把失败链上的输出合并到每个状态"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find_keywords(self, text):
+        """返回文本中出现的全部关键词（小写形式，去重）"""
+        found = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def classify(self, *texts):
+        """
+        对若干段文本分类
+
+        返回 (命中的分类列表, 命中的关键词列表)，分类按配置顺序、关键词按字母顺序排列
+        """
+        keywords = set()
+        for text in texts:
+            if text:
+                keywords |= self.find_keywords(text)
+
+        matched = {category for keyword in keywords for category in self._keyword_categories[keyword]}
+        return [c for c in self.categories if c in matched], sorted(self._display[k] for k in keywords)
+
+    def tag(self, item, *texts):
+        """把分类结果写入条目的categories和matched_keywords字段（标题总是参与匹配）"""
+        categories, keywords = self.classify(item.get('title', ''), *texts)
+        item['categories'] = SEPARATOR.join(categories)
+        item['matched_keywords'] = SEPARATOR.join(keywords)
+        return item
+
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表页离线解析
+基于预编译lxml XPath的纯函数解析器，把listOrder结果页的HTML（page_source或HTTP原始字节）
+转换为与extract_search_results相同结构的项目字典
+"""
+
+import re
+from datetime import datetime
+from urllib.parse import urljoin
+
+from lxml import etree, html as lxml_html
+
+
+def _has_class(name):
+    """生成匹配class的XPath片段"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 浏览器把不在thead/tfoot中的行都归入tbody，lxml不会自动补全tbody，按“排除表头表尾行”等价匹配
+_BODY_ROW = "tr[not(ancestor::thead) and not(ancestor::tfoot)]"
+
+# 与extract_search_results相同顺序的结果表格定位
+RESULT_ROW_XPATHS = [
+    (".custom_table table", etree.XPath(f"//*[{_has_class('custom_table')}]//table//{_BODY_ROW}")),
+    ("table.yhzxtab", etree.XPath(f"//table[{_has_class('yhzxtab')}]//{_BODY_ROW}")),
+    ("#result", etree.XPath("//*[@id='result']//tr")),
+    (".custom_table tbody", etree.XPath(f"//*[{_has_class('custom_table')}]//{_BODY_ROW}"))
+]
+
+# 通用方法：页面中所有表格行（第一行视为表头）
+ALL_TABLE_ROWS_XPATH = etree.XPath("//table//tr")
+
+CELLS_XPATH = etree.XPath("./td")
+FIRST_LINK_XPATH = etree.XPath(".//a[1]")
+
+# lxml不接受带编码声明的str输入
+XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def _text(element):
+    """提取元素的可见文本"""
+    return element.text_content().strip()
+
+
+def parse_document(source, encoding=None):
+    """把HTML字符串或字节解析为lxml文档树"""
+    if isinstance(source, bytes):
+        parser = lxml_html.HTMLParser(encoding=encoding) if encoding else None
+        return lxml_html.document_fromstring(source, parser=parser)
+    return lxml_html.document_fromstring(XML_DECLARATION_RE.sub('', source, count=1))
+
+
+def find_result_rows(tree):
+    """定位结果表格的数据行，返回 (匹配的选择器, 行列表)"""
+    for selector, xpath in RESULT_ROW_XPATHS:
+        rows = xpath(tree)
+        if rows:
+            return selector, rows
+
+    rows = ALL_TABLE_ROWS_XPATH(tree)
+    if len(rows) > 1:
+        return None, rows[1:]
+    return None, []
+
+
+def parse_listing(source, base_url=None, encoding=None):
+    """
+    解析列表页，返回项目字典列表
+
+    每个字典包含 index/title/link/info_type/area/pub_date/extracted_time，
+    与ZhaobiaoSpider.extract_search_results的输出一致
+    """
+    tree = parse_document(source, encoding)
+    _, rows = find_result_rows(tree)
+
+    extracted_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    results = []
+
+    for i, row in enumerate(rows):
+        cells = CELLS_XPATH(row)
+        if len(cells) < 4:
+            continue
+
+        links = FIRST_LINK_XPATH(cells[0])
+        if not links:
+            continue
+
+        href = links[0].get('href', '')
+        results.append({
+            'index': i + 1,
+            'title': _text(links[0]),
+            'link': urljoin(base_url, href) if base_url else href,
+            'info_type': _text(cells[1]),
+            'area': _text(cells[2]),
+            'pub_date': _text(cells[3]),
+            'extracted_time': extracted_time
+        })
+
+    return results
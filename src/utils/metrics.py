@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+运行指标
+记录各阶段耗时（span）、计数和读写字节数，运行结束时写出JSON格式的指标文件，
+用于定位瓶颈和对比不同运行之间的性能变化
+"""
+
+import functools
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+def percentile(sorted_values, pct):
+    """最近秩法计算百分位数（输入需已排序）"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunMetrics:
+    """线程安全的运行指标收集器"""
+
+    def __init__(self, logger=None):
+        """初始化收集器"""
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._failures = {}
+        self.counters = {}
+        self.bytes = {}
+
+    def record(self, stage, elapsed, ok=True):
+        """记录一次阶段耗时"""
+        with self._lock:
+            self._durations.setdefault(stage, []).append(elapsed)
+            if not ok:
+                self._failures[stage] = self._failures.get(stage, 0) + 1
+
+    @contextmanager
+    def span(self, stage):
+        """计时上下文，块内抛出异常时记为失败"""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(stage, time.perf_counter() - started, ok)
+
+    def incr(self, name, amount=1):
+        """增加计数"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_bytes(self, name, amount):
+        """累计字节数"""
+        with self._lock:
+            self.bytes[name] = self.bytes.get(name, 0) + amount
+
+    def stage_summary(self):
+        """各阶段的次数、失败数和耗时统计（秒）"""
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self._durations.items()}
+            failures = dict(self._failures)
+
+        summary = {}
+        for stage, values in durations.items():
+            total = sum(values)
+            summary[stage] = {
+                'count': len(values),
+                'failed': failures.get(stage, 0),
+                'total': round(total, 4),
+                'mean': round(total / len(values), 4),
+                'p50': round(percentile(values, 50), 4),
+                'p95': round(percentile(values, 95), 4),
+                'max': round(values[-1], 4)
+            }
+        return summary
+
+    def report(self):
+        """生成完整的指标报告"""
+        with self._lock:
+            counters = dict(self.counters)
+            byte_counts = dict(self.bytes)
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'duration': round(time.perf_counter() - self._started, 3),
+            'stages': self.stage_summary(),
+            'counters': counters,
+            'bytes': byte_counts
+        }
+
+    def write(self, log_dir):
+        """把指标报告写入 log_dir/metrics_时间戳.json，返回文件路径"""
+        path = Path(log_dir) / f"metrics_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def timed(stage):
+    """
+    方法计时装饰器，使用实例的metrics属性记录耗时
+
+    方法返回False或None时同样记为失败
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, 'metrics', None)
+            if metrics is None:
+                return func(self, *args, **kwargs)
+
+            started = time.perf_counter()
+            result = None
+            try:
+                result = func(self, *args, **kwargs)
+                return result
+            finally:
+                metrics.record(stage, time.perf_counter() - started, result is not None and result is not False)
+        return wrapper
+    return decorator
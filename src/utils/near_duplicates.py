@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似重复检测
+同一项目常以不同信息类型、地区或在多个定制条件下重复发布。
+对详情页正文计算64位SimHash指纹，按16位分为4段建立LSH索引：
+汉明距离不超过3的两个指纹至少有一段完全相同，只需比较同段的候选页面，无需两两比较。
+重复页面归入最早采集的规范项目（canonical）之下
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_fingerprints (
+    link           TEXT PRIMARY KEY,
+    simhash        INTEGER NOT NULL,
+    canonical_link TEXT,
+    distance       INTEGER,
+    detected_at    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_canonical ON page_fingerprints(canonical_link);
+
+CREATE TABLE IF NOT EXISTS fingerprint_bands (
+    band  INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    link  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fingerprint_bands ON fingerprint_bands(band, value);
+CREATE INDEX IF NOT EXISTS idx_fingerprint_bands_link ON fingerprint_bands(link);
+"""
+
+HASH_BITS = 64
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+SHINGLE_SIZE = 4
+_NON_TEXT_RE = re.compile(r'[\s\W_]+', re.UNICODE)
+
+
+def _to_signed(value):
+    """64位无符号整数转为SQLite可存储的有符号整数"""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def _to_unsigned(value):
+    """从SQLite读出的有符号整数还原为无符号整数"""
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+def simhash(text):
+    """
+    计算文本的64位SimHash
+
+    去掉空白和标点后按4字切片，每个切片哈希的各位按出现次数加权投票
+    """
+    normalized = _NON_TEXT_RE.sub('', text.lower())
+    if len(normalized) < SHINGLE_SIZE:
+        shingles = [normalized] if normalized else []
+    else:
+        shingles = [normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)]
+
+    counts = {}
+    for shingle in shingles:
+        counts[shingle] = counts.get(shingle, 0) + 1
+
+    # 先按 (字节位置, 字节值) 累计权重，再展开到64位，每个切片只需8次累加
+    byte_weights = [[0] * 256 for _ in range(HASH_BITS // 8)]
+    for shingle, weight in counts.items():
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+        for position, byte in enumerate(digest):
+            byte_weights[position][byte] += weight
+
+    ones = [0] * HASH_BITS
+    for position, weights in enumerate(byte_weights):
+        base_bit = (HASH_BITS // 8 - 1 - position) * 8
+        for byte, weight in enumerate(weights):
+            if weight:
+                for offset in range(8):
+                    if byte >> offset & 1:
+                        ones[base_bit + offset] += weight
+
+    # 某一位上置1的加权票数超过一半时，指纹该位为1
+    total = sum(counts.values())
+    fingerprint = 0
+    for bit, weight in enumerate(ones):
+        if weight * 2 > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    """两个指纹的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+def bands(fingerprint):
+    """把指纹分为若干段，返回 (段号, 段值) 列表"""
+    return [(band, fingerprint >> (band * BAND_BITS) & BAND_MASK) for band in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """基于SimHash和LSH分段的近似重复索引（线程安全）"""
+
+    def __init__(self, db_path, max_distance=3, logger=None):
+        """
+        打开数据库
+
+        max_distance为判定重复的最大汉明距离，不超过段数-1时LSH查找不会漏掉候选
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        if max_distance > BANDS - 1:
+            self.logger.warning(f"近似重复距离{max_distance}超过{BANDS - 1}，部分重复页面可能检测不到")
+        self.max_distance = max_distance
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+
+    def _candidates(self, link, fingerprint):
+        """查找至少有一段相同的已登记页面，返回 (链接, 指纹, 规范链接) 列表"""
+        clauses = ' OR '.join('(b.band = ? AND b.value = ?)' for _ in range(BANDS))
+        params = [part for pair in bands(fingerprint) for part in pair]
+        rows = self.conn.execute(
+            f"""
+            SELECT DISTINCT f.link, f.simhash, f.canonical_link
+            FROM fingerprint_bands b JOIN page_fingerprints f ON f.link = b.link
+            WHERE ({clauses}) AND b.link != ?
+            """,
+            params + [link]
+        ).fetchall()
+        return [(row['link'], _to_unsigned(row['simhash']), row['canonical_link']) for row in rows]
+
+    def register(self, link, text):
+        """
+        登记页面并检测是否与已登记页面近似重复
+
+        返回 (规范链接, 汉明距离)；不是重复页面时返回 (None, None)。
+        重复页面归入最相近页面所属的规范项目
+        """
+        fingerprint = simhash(text)
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        with self._lock, self.conn:
+            best = None
+            for candidate_link, candidate_hash, candidate_canonical in self._candidates(link, fingerprint):
+                distance = hamming_distance(fingerprint, candidate_hash)
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (candidate_canonical or candidate_link, distance)
+
+            # 本身是其他页面的规范项目时不再归入别处，避免形成环
+            is_canonical = self.conn.execute(
+                "SELECT 1 FROM page_fingerprints WHERE canonical_link = ? LIMIT 1", (link,)
+            ).fetchone()
+            canonical_link, distance = best if best and not is_canonical else (None, None)
+
+            self.conn.execute(
+                """
+                INSERT INTO page_fingerprints (link, simhash, canonical_link, distance, detected_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    simhash = excluded.simhash,
+                    canonical_link = excluded.canonical_link,
+                    distance = excluded.distance,
+                    detected_at = excluded.detected_at
+                """,
+                (link, _to_signed(fingerprint), canonical_link, distance, now)
+            )
+            self.conn.execute("DELETE FROM fingerprint_bands WHERE link = ?", (link,))
+            self.conn.executemany(
+                "INSERT INTO fingerprint_bands (band, value, link) VALUES (?, ?, ?)",
+                [(band, value, link) for band, value in bands(fingerprint)]
+            )
+
+        return canonical_link, distance
+
+    def group(self, canonical_link):
+        """返回归入指定规范项目的全部重复页面链接"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT link FROM page_fingerprints WHERE canonical_link = ? ORDER BY detected_at",
+                (canonical_link,)
+            ).fetchall()
+        return [row['link'] for row in rows]
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容寻址的页面归档
+以原始页面内容的SHA-256作为键，压缩（zstd，不可用时gzip）后写入data/raw，
+相同内容只存储一次，链接与归档对象的对应关系记录在招标信息索引库中
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+class PageArchive:
+    """内容寻址的压缩归档存储"""
+
+    def __init__(self, root, compression='zstd', level=None, logger=None):
+        """初始化归档目录和压缩方式"""
+        self.root = Path(root) / "blobs"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+        self.compression = compression
+        if compression == 'zstd':
+            try:
+                import zstandard
+                self._zstandard = zstandard
+            except ImportError:
+                self.logger.warning("未安装zstandard，归档改用gzip压缩")
+                self.compression = 'gzip'
+        # gzip压缩级别最高为9
+        self.level = (level or 10) if self.compression == 'zstd' else min(level or 6, 9)
+        self.suffix = '.zst' if self.compression == 'zstd' else '.gz'
+        # zstandard的压缩器不是线程安全的，每个线程使用各自的实例
+        self._local = threading.local()
+
+    def blob_path(self, blob_hash, suffix=None):
+        """归档对象的存储路径（两级目录分散文件）"""
+        return self.root / blob_hash[:2] / blob_hash[2:4] / f"{blob_hash}{suffix or self.suffix}"
+
+    def _compress(self, data):
+        """压缩数据"""
+        if self.compression == 'zstd':
+            compressor = getattr(self._local, 'compressor', None)
+            if compressor is None:
+                compressor = self._zstandard.ZstdCompressor(level=self.level)
+                self._local.compressor = compressor
+            return compressor.compress(data)
+        # mtime固定为0，相同内容得到相同的压缩结果
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def store(self, content):
+        """
+        归档一份页面内容
+
+        返回 (内容哈希, 原始大小, 压缩后大小, 是否新写入)；内容已存在时不再写入
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        blob_hash = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(blob_hash)
+
+        if path.exists():
+            return blob_hash, len(data), path.stat().st_size, False
+
+        compressed = self._compress(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 先写临时文件再原子替换，并发写入同一内容也是安全的
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        return blob_hash, len(data), len(compressed), True
+
+    def load(self, blob_hash):
+        """读取并解压归档内容（兼容两种压缩格式）"""
+        zst_path = self.blob_path(blob_hash, '.zst')
+        if zst_path.exists():
+            import zstandard
+            with open(zst_path, 'rb') as f:
+                return zstandard.ZstdDecompressor().decompress(f.read())
+
+        with open(self.blob_path(blob_hash, '.gz'), 'rb') as f:
+            return gzip.decompress(f.read())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+详情页全文检索
+把已保存详情页的可见文本切分为中文二元组（bigram）后写入SQLite FTS5索引，
+与招标信息索引库共用同一个数据库文件；页面保存后增量更新，查询按BM25排序并返回摘要
+正文只保存在page_docs中，FTS表为无内容表（content=''），只保存倒排索引
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from utils.listing_parser import parse_document
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_docs (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    link       TEXT NOT NULL UNIQUE,
+    title      TEXT,
+    info_type  TEXT,
+    area       TEXT,
+    pub_date   TEXT,
+    local_path TEXT,
+    body       TEXT,
+    indexed_at TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS page_fts USING fts5(
+    title, body, content = '', tokenize = 'unicode61'
+);
+"""
+
+# 中日韩统一表意文字（含扩展A区和兼容区）
+CJK_RUN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+TOKEN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[0-9A-Za-z]+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+SNIPPET_BEFORE = 30
+SNIPPET_AFTER = 70
+
+
+def cjk_bigrams(text):
+    """
+    把文本切分为检索词：连续汉字切成相互重叠的二元组，字母数字串保持整词
+
+    返回按原文顺序排列的词列表（短语查询依赖这一顺序）
+    """
+    tokens = []
+    for match in TOKEN_RE.finditer(text):
+        run = match.group(0)
+        if CJK_RUN_RE.fullmatch(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run.lower())
+    return tokens
+
+
+def index_tokens(text):
+    """
+    切分待索引的文本：在cjk_bigrams的基础上，为每段连续汉字的最后一个字补一个单字词
+
+    单字查询按前缀匹配二元组，只有段末的字不是任何二元组的首字，补上单字词后才能命中
+    """
+    tokens = []
+    for match in TOKEN_RE.finditer(text):
+        run = match.group(0)
+        tokens.extend(cjk_bigrams(run))
+        if len(run) > 1 and CJK_RUN_RE.fullmatch(run):
+            tokens.append(run[-1])
+    return ' '.join(tokens)
+
+
+def visible_text(page_source):
+    """提取页面的可见文本（去掉脚本和样式，合并空白）"""
+    document = parse_document(page_source)
+    for element in document.xpath('//script|//style|//noscript'):
+        element.drop_tree()
+    return WHITESPACE_RE.sub(' ', document.text_content()).strip()
+
+
+def build_match_query(query):
+    """
+    把用户查询转换为FTS5 MATCH表达式
+
+    空格分隔的每个词都必须出现；中文词按二元组组成短语，单个汉字按前缀匹配（段末的字由单字词命中）
+    """
+    clauses = []
+    for term in query.split():
+        for match in TOKEN_RE.finditer(term):
+            run = match.group(0)
+            tokens = cjk_bigrams(run)
+            if len(run) == 1 and CJK_RUN_RE.fullmatch(run):
+                clauses.append(f'"{run}"*')
+            else:
+                clauses.append('"' + ' '.join(tokens) + '"')
+    return ' AND '.join(clauses)
+
+
+def make_snippet(body, terms):
+    """在原文中截取第一个命中词附近的片段，并用【】标出命中词"""
+    lowered = body.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [pos for pos in positions if pos >= 0]
+    if not positions:
+        return body[:SNIPPET_BEFORE + SNIPPET_AFTER]
+
+    start = max(0, min(positions) - SNIPPET_BEFORE)
+    end = min(len(body), min(positions) + SNIPPET_AFTER)
+    snippet = body[start:end]
+    for term in sorted(set(terms), key=len, reverse=True):
+        snippet = re.sub(re.escape(term), lambda m: f"【{m.group(0)}】", snippet, flags=re.IGNORECASE)
+    return ('…' if start > 0 else '') + snippet + ('…' if end < len(body) else '')
+
+
+class PageSearchIndex:
+    """详情页全文索引（线程安全）"""
+
+    def __init__(self, db_path, logger=None):
+        """打开数据库并创建索引表"""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self._drop_stored_content_fts()
+            self.conn.executescript(SCHEMA)
+            if self._rebuild_needed:
+                self._rebuild_fts()
+
+    def _drop_stored_content_fts(self):
+        """旧版FTS表自带一份正文副本，删除后按page_docs重建为无内容表"""
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'page_fts'"
+        ).fetchone()
+        self._rebuild_needed = bool(row) and "content = ''" not in row['sql']
+        if self._rebuild_needed:
+            self.conn.execute("DROP TABLE page_fts")
+
+    def _rebuild_fts(self):
+        """按page_docs中的正文重建全文索引"""
+        rows = self.conn.execute("SELECT id, title, body FROM page_docs").fetchall()
+        self.conn.executemany(
+            "INSERT INTO page_fts (rowid, title, body) VALUES (?, ?, ?)",
+            ((row['id'], index_tokens(row['title'] or ''), index_tokens(row['body'] or '')) for row in rows)
+        )
+        self.logger.info(f"全文索引已重建: {len(rows)} 个页面")
+
+    def index_page(self, link, item, text, local_path=None):
+        """写入或更新一个页面的索引（同一链接只保留最新内容）"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        title = item.get('title', '')
+        with self._lock, self.conn:
+            # 无内容表不保存原文，删除旧索引时需要提供原来写入的词
+            old = self.conn.execute("SELECT id, title, body FROM page_docs WHERE link = ?", (link,)).fetchone()
+            if old:
+                self.conn.execute(
+                    "INSERT INTO page_fts (page_fts, rowid, title, body) VALUES ('delete', ?, ?, ?)",
+                    (old['id'], index_tokens(old['title'] or ''), index_tokens(old['body'] or ''))
+                )
+            self.conn.execute(
+                """
+                INSERT INTO page_docs (link, title, info_type, area, pub_date, local_path, body, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    title = excluded.title,
+                    info_type = excluded.info_type,
+                    area = excluded.area,
+                    pub_date = excluded.pub_date,
+                    local_path = COALESCE(excluded.local_path, page_docs.local_path),
+                    body = excluded.body,
+                    indexed_at = excluded.indexed_at
+                """,
+                (link, title, item.get('info_type'), item.get('area'), item.get('pub_date'),
+                 str(local_path) if local_path else None, text, now)
+            )
+            doc_id = self.conn.execute("SELECT id FROM page_docs WHERE link = ?", (link,)).fetchone()['id']
+            self.conn.execute(
+                "INSERT INTO page_fts (rowid, title, body) VALUES (?, ?, ?)",
+                (doc_id, index_tokens(title), index_tokens(text))
+            )
+
+    def reindex_saved(self):
+        """
+        为招标信息索引库中已保存、但尚未建立全文索引的页面补建索引
+
+        返回新建索引的页面数
+        """
+        with self._lock:
+            has_tenders = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tenders'"
+            ).fetchone()
+            if not has_tenders:
+                return 0
+            rows = self.conn.execute(
+                """
+                SELECT t.link, t.title, t.info_type, t.area, t.pub_date, t.local_path
+                FROM tenders t LEFT JOIN page_docs d ON d.link = t.link
+                WHERE t.local_path IS NOT NULL AND d.id IS NULL
+                """
+            ).fetchall()
+
+        count = 0
+        for row in rows:
+            path = Path(row['local_path'])
+            if not path.exists():
+                continue
+            try:
+                text = visible_text(path.read_text(encoding='utf-8', errors='ignore'))
+                self.index_page(row['link'], dict(row), text, path)
+                count += 1
+            except Exception as e:
+                self.logger.warning(f"全文索引补建失败: {path}: {e}")
+        return count
+
+    def search(self, query, limit=20):
+        """
+        全文检索
+
+        返回按相关度排序的结果列表，每项包含 link/title/info_type/area/pub_date/local_path/snippet/score
+        """
+        match_query = build_match_query(query)
+        if not match_query:
+            return []
+
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT d.link, d.title, d.info_type, d.area, d.pub_date, d.local_path, d.body, hits.score
+                FROM (
+                    SELECT rowid, bm25(page_fts, 5.0, 1.0) AS score
+                    FROM page_fts WHERE page_fts MATCH ?
+                    ORDER BY score LIMIT ?
+                ) AS hits
+                JOIN page_docs d ON d.id = hits.rowid
+                ORDER BY hits.score
+                """,
+                (match_query, limit)
+            ).fetchall()
+
+        terms = [match.group(0) for match in TOKEN_RE.finditer(query)]
+        results = []
+        for row in rows:
+            result = dict(row)
+            result['snippet'] = make_snippet(result.pop('body') or '', terms)
+            result['score'] = round(-result['score'], 4)
+            results.append(result)
+        return results
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
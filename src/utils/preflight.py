@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动前检查
+并发执行相互独立的检查项，跳过与当前运行模式无关的检查，
+并把很少变化的检查结果（目录结构、驱动是否存在等）按TTL缓存到本地
+"""
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class PreflightCheck:
+    """单个检查项"""
+
+    def __init__(self, name, func, cache_ttl=0, enabled=True):
+        """
+        初始化检查项
+
+        func() 返回 (是否通过, 说明文字)；cache_ttl>0 时通过的结果会被缓存
+        """
+        self.name = name
+        self.func = func
+        self.cache_ttl = cache_ttl
+        self.enabled = enabled
+
+
+class PreflightRunner:
+    """检查执行器"""
+
+    def __init__(self, cache_file, logger=None):
+        """初始化执行器"""
+        self.cache_file = Path(cache_file)
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        self.cache = self._load_cache()
+
+    def _load_cache(self):
+        """读取缓存文件"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        """写入缓存文件"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            self.logger.warning(f"检查结果缓存写入失败: {e}")
+
+    def _cached(self, check):
+        """返回仍在有效期内的缓存结果"""
+        entry = self.cache.get(check.name)
+        if check.cache_ttl > 0 and entry and time.time() - entry['checked_at'] < check.cache_ttl:
+            return entry
+        return None
+
+    def _execute(self, check):
+        """执行单个检查（异常视为未通过）"""
+        started = time.perf_counter()
+        try:
+            ok, message = check.func()
+        except Exception as e:
+            ok, message = False, f"{check.name}检查失败: {e}"
+        return {
+            'name': check.name,
+            'ok': bool(ok),
+            'message': message,
+            'cached': False,
+            'elapsed': time.perf_counter() - started
+        }
+
+    def run(self, checks, parallel=True):
+        """
+        执行所有启用的检查项，结果按传入顺序返回
+
+        每个结果包含 name/ok/message/cached/elapsed
+        """
+        results = {}
+        pending = []
+        for check in checks:
+            if not check.enabled:
+                continue
+            entry = self._cached(check)
+            if entry:
+                results[check.name] = {
+                    'name': check.name, 'ok': True, 'message': entry['message'],
+                    'cached': True, 'elapsed': 0.0
+                }
+            else:
+                pending.append(check)
+
+        if parallel and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='preflight') as executor:
+                for result in executor.map(self._execute, pending):
+                    results[result['name']] = result
+        else:
+            for check in pending:
+                results[check.name] = self._execute(check)
+
+        # 只缓存通过的结果，失败项下次仍会重新检查
+        for check in pending:
+            result = results[check.name]
+            if check.cache_ttl > 0 and result['ok']:
+                self.cache[check.name] = {'checked_at': time.time(), 'message': result['message']}
+        if pending:
+            self._save_cache()
+
+        return [results[check.name] for check in checks if check.name in results]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+登录会话持久化
+把登录后的Cookie序列化到本地文件，下次运行时恢复，会话过期后才需要重新手动登录
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+
+class SessionStore:
+    """Cookie文件存储"""
+
+    def __init__(self, cookie_file, max_age_hours=72, logger=None):
+        """初始化存储"""
+        self.cookie_file = Path(cookie_file)
+        self.max_age_seconds = max_age_hours * 3600 if max_age_hours else None
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+    def save(self, driver):
+        """保存浏览器当前的全部Cookie，返回保存的数量"""
+        cookies = driver.get_cookies()
+        self.cookie_file.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_file = self.cookie_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': time.time(), 'cookies': cookies}, f, ensure_ascii=False)
+        try:
+            os.chmod(tmp_file, 0o600)  # Cookie等同于登录凭据
+        except OSError:
+            pass
+        os.replace(tmp_file, self.cookie_file)
+
+        self.logger.info(f"登录会话已保存: {len(cookies)} 个Cookie")
+        return len(cookies)
+
+    def load(self):
+        """读取保存的Cookie，文件不存在、损坏或过期时返回空列表"""
+        if not self.cookie_file.exists():
+            return []
+
+        try:
+            with open(self.cookie_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"登录会话文件读取失败: {e}")
+            return []
+
+        if self.max_age_seconds and time.time() - data.get('saved_at', 0) > self.max_age_seconds:
+            self.logger.info("保存的登录会话已超过有效期")
+            return []
+
+        # 去掉已过期的Cookie
+        now = time.time()
+        return [c for c in data.get('cookies', []) if not c.get('expiry') or c['expiry'] > now]
+
+    def clear(self):
+        """删除保存的会话"""
+        try:
+            self.cookie_file.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+静态站点索引页
+按发布日期、定制条件和信息类型把已保存的详情页分组成索引分片，
+每个分片的条目单独保存为JSON，新增页面只重新生成受影响的分片和总索引。
+新增条目先追加到日志文件，运行中断后下次启动时重放；
+索引页输出到单独的目录，上传到与详情页相同的远程目录
+"""
+
+import json
+import logging
+import re
+import threading
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from urllib.parse import quote
+
+
+ROOT_INDEX_NAME = "index.html"
+CATALOG_NAME = "catalog.json"
+JOURNAL_NAME = "pending.jsonl"
+
+# 分片类型及其在总索引中的标题
+SHARD_KINDS = {
+    'day': '按日期',
+    'condition': '按定制条件',
+    'type': '按信息类型'
+}
+
+PAGE_STYLE = """
+        body { font-family: 'Microsoft YaHei', Arial, sans-serif; margin: 20px; color: #333; }
+        h1 { font-size: 22px; }
+        h2 { font-size: 18px; margin-top: 24px; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border-bottom: 1px solid #ddd; padding: 6px 8px; text-align: left; }
+        th { background: #f5f5f5; }
+        a { color: #1a5fb4; text-decoration: none; }
+"""
+
+DATE_RE = re.compile(r'(\d{4})[-/.年](\d{1,2})[-/.月](\d{1,2})')
+UNSAFE_NAME_RE = re.compile(r'[<>:"/\\|?*\s]+')
+
+
+def _text(value):
+    """转义文本内容"""
+    return escape('' if value is None else str(value))
+
+
+def _href(filename):
+    """同目录文件的相对链接"""
+    return quote(filename)
+
+
+def entry_day(pub_date, captured_at):
+    """条目所属日期（YYYYMMDD），发布时间无法解析时使用采集日期"""
+    match = DATE_RE.search(pub_date or '')
+    if match:
+        year, month, day = match.groups()
+        return f"{year}{int(month):02d}{int(day):02d}"
+    return captured_at[:10].replace('-', '')
+
+
+def shard_filename(kind, value):
+    """分片索引页的文件名"""
+    safe_value = UNSAFE_NAME_RE.sub('_', str(value)).strip('_') or 'unknown'
+    return f"index_{kind}_{safe_value}.html"
+
+
+class SiteIndex:
+    """增量维护的索引分片"""
+
+    def __init__(self, state_dir, output_dir, logger=None):
+        """
+        初始化索引
+
+        state_dir保存分片数据（JSON），output_dir为索引页输出目录
+        """
+        self.state_dir = Path(state_dir)
+        self.shards_dir = self.state_dir / "shards"
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+        self._lock = threading.Lock()
+        self._shards = {}
+        self._dirty = set()
+        self.catalog = self._read_json(self.state_dir / CATALOG_NAME)
+        self.journal_path = self.state_dir / JOURNAL_NAME
+        self._replay_journal()
+
+    @staticmethod
+    def _read_json(path):
+        """读取JSON文件，不存在或损坏时返回空字典"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_json(path, data):
+        """写入JSON文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+
+    def _shard(self, key):
+        """按需加载分片条目（filename -> 条目）"""
+        if key not in self._shards:
+            self._shards[key] = self._read_json(self.shards_dir / f"{key}.json")
+        return self._shards[key]
+
+    def _replay_journal(self):
+        """重放上次运行中登记、但未生成索引页的条目"""
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+
+        replayed = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 中断时写了一半的行
+            if self._apply(entry):
+                replayed += 1
+        if replayed:
+            self.logger.info(f"已重放 {replayed} 个未生成索引页的条目")
+
+    def _apply(self, entry):
+        """把条目写入所属的分片，返回是否有分片发生变化"""
+        shard_values = {
+            'day': entry_day(entry['pub_date'], entry['captured_at']),
+            'condition': f"{int(entry['condition_num']):02d}",
+            'type': entry['info_type'] or '未分类'
+        }
+
+        changed = False
+        for kind, value in shard_values.items():
+            key = shard_filename(kind, value)[:-len('.html')]
+            entries = self._shard(key)
+            previous = entries.get(entry['filename'])
+            if previous and all(previous.get(k) == entry[k] for k in ('title', 'info_type', 'area', 'pub_date')):
+                continue  # 同一页面再次保存且信息未变，分片无需更新
+            stored = dict(entry)
+            if previous:
+                stored['captured_at'] = previous['captured_at']
+            entries[entry['filename']] = stored
+            self.catalog[key] = {'kind': kind, 'value': value, 'count': len(entries)}
+            self._dirty.add(key)
+            changed = True
+        return changed
+
+    def add(self, filename, item, condition_num):
+        """登记一个已保存的详情页，只把它所属的分片标记为需要重新生成"""
+        entry = {
+            'filename': filename,
+            'title': item.get('title', ''),
+            'info_type': item.get('info_type', ''),
+            'area': item.get('area', ''),
+            'pub_date': item.get('pub_date', ''),
+            'condition_num': condition_num,
+            'captured_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        with self._lock:
+            if not self._apply(entry):
+                return
+            # 立即追加到日志，运行中断也不会丢失
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def _render_page(self, title, body):
+        """索引页外框"""
+        return (
+            '<!DOCTYPE html>\n<html lang="zh-CN"><head><meta charset="utf-8"/>'
+            f'<title>{_text(title)}</title><style>{PAGE_STYLE}</style></head>'
+            f'<body><h1>{_text(title)}</h1>{body}</body></html>\n'
+        )
+
+    def _render_shard(self, key):
+        """渲染单个分片的索引页"""
+        info = self.catalog[key]
+        entries = sorted(
+            self._shard(key).values(),
+            key=lambda e: (e['pub_date'], e['captured_at']),
+            reverse=True
+        )
+        rows = ''.join(
+            f'<tr><td><a href="{_href(e["filename"])}">{_text(e["title"])}</a></td>'
+            f'<td>{_text(e["info_type"])}</td><td>{_text(e["area"])}</td>'
+            f'<td>{_text(e["pub_date"])}</td><td>{int(e["condition_num"]):02d}</td></tr>'
+            for e in entries
+        )
+        body = (
+            f'<p><a href="{ROOT_INDEX_NAME}">返回总索引</a> · 共 {len(entries)} 条</p>'
+            '<table><tr><th>项目标题</th><th>信息类型</th><th>地区</th><th>发布时间</th><th>定制条件</th></tr>'
+            f'{rows}</table>'
+        )
+        return self._render_page(f"{SHARD_KINDS[info['kind']]}: {info['value']}", body)
+
+    def _render_root(self):
+        """渲染总索引页（只列出各分片及条目数）"""
+        sections = []
+        for kind, label in SHARD_KINDS.items():
+            shards = sorted(
+                ((key, info) for key, info in self.catalog.items() if info['kind'] == kind),
+                key=lambda pair: pair[1]['value'],
+                reverse=kind == 'day'
+            )
+            if not shards:
+                continue
+            links = ''.join(
+                f'<li><a href="{_href(key + ".html")}">{_text(info["value"])}</a> ({info["count"]})</li>'
+                for key, info in shards
+            )
+            sections.append(f'<h2>{label}</h2><ul>{links}</ul>')
+        updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return self._render_page("招标信息索引", f'<p>更新时间: {updated}</p>{"".join(sections)}')
+
+    def flush(self):
+        """
+        重新生成有变化的分片和总索引
+
+        返回写出的 (本地路径, 文件名) 列表；没有变化时返回空列表
+        """
+        with self._lock:
+            if not self._dirty:
+                return []
+
+            written = []
+            for key in sorted(self._dirty):
+                self._write_json(self.shards_dir / f"{key}.json", self._shard(key))
+                filename = f"{key}.html"
+                path = self.output_dir / filename
+                path.write_text(self._render_shard(key), encoding='utf-8')
+                written.append((path, filename))
+
+            self._write_json(self.state_dir / CATALOG_NAME, self.catalog)
+            root_path = self.output_dir / ROOT_INDEX_NAME
+            root_path.write_text(self._render_root(), encoding='utf-8')
+            written.append((root_path, ROOT_INDEX_NAME))
+
+            # 分片和索引页已落盘，日志中的条目不再需要
+            self.journal_path.unlink(missing_ok=True)
+
+            self.logger.info(f"索引页已更新: {len(written) - 1} 个分片")
+            self._dirty.clear()
+            return written
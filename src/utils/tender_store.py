@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+招标信息SQLite索引
+记录每条已提取的招标信息及其保存、上传状态，用于增量抓取时跳过已成功采集的链接
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tenders (
+    link          TEXT PRIMARY KEY,
+    title         TEXT,
+    info_type     TEXT,
+    area          TEXT,
+    pub_date      TEXT,
+    condition_num INTEGER,
+    extracted_at  TEXT,
+    captured_at   TEXT,
+    local_path    TEXT,
+    remote_url    TEXT,
+    status        TEXT NOT NULL DEFAULT 'extracted',
+    content_hash  TEXT,
+    revision      INTEGER NOT NULL DEFAULT 0,
+    updated_at    TEXT,
+    checked_at    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tenders_status ON tenders(status);
+CREATE INDEX IF NOT EXISTS idx_tenders_pub_date ON tenders(pub_date);
+CREATE INDEX IF NOT EXISTS idx_tenders_captured_at ON tenders(captured_at);
+
+CREATE TABLE IF NOT EXISTS captures (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    link        TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    blob_hash   TEXT NOT NULL,
+    raw_size    INTEGER,
+    stored_size INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_captures_link ON captures(link);
+CREATE INDEX IF NOT EXISTS idx_captures_blob ON captures(blob_hash);
+"""
+
+# 状态流转: extracted -> saved -> uploaded（近似重复且配置为跳过时: extracted -> duplicate）
+STATUS_EXTRACTED = 'extracted'
+STATUS_SAVED = 'saved'
+STATUS_UPLOADED = 'uploaded'
+STATUS_DUPLICATE = 'duplicate'
+
+# 内容比对结果
+CONTENT_NEW = 'new'
+CONTENT_UNCHANGED = 'unchanged'
+CONTENT_UPDATED = 'updated'
+
+# 旧版本数据库需要补充的列
+MIGRATION_COLUMNS = [
+    ("content_hash", "TEXT"),
+    ("revision", "INTEGER NOT NULL DEFAULT 0"),
+    ("updated_at", "TEXT"),
+    ("checked_at", "TEXT")
+]
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def content_hash(text):
+    """
+    计算页面内容的稳定哈希（忽略空白差异）
+
+    应传入页面的可见文本：HTTP原始HTML与浏览器渲染后的DOM标记不同，可见文本相同
+    """
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TenderStore:
+    """招标信息索引库（线程安全）"""
+
+    def __init__(self, db_path, logger=None):
+        """打开（必要时创建）数据库"""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        """为旧版本数据库补充缺失的列"""
+        existing = {row['name'] for row in self.conn.execute("PRAGMA table_info(tenders)")}
+        for column, definition in MIGRATION_COLUMNS:
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE tenders ADD COLUMN {column} {definition}")
+
+    @staticmethod
+    def _now():
+        """当前时间字符串"""
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def captured_links(self, links, checked_since=None):
+        """
+        返回给定链接中已成功采集（已上传，或作为重复页面跳过）的链接集合
+
+        指定checked_since时，最近一次抓取早于该时间的链接不计入，以便重新检查内容是否变化
+        """
+        links = list(links)
+        captured = set()
+        recheck_clause = " AND COALESCE(checked_at, captured_at) >= ?" if checked_since else ""
+        with self._lock:
+            # 分批查询，避免超出SQLite参数个数限制
+            for start in range(0, len(links), 500):
+                batch = links[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT link FROM tenders WHERE status IN (?, ?) AND link IN ({placeholders})"
+                    + recheck_clause,
+                    [STATUS_UPLOADED, STATUS_DUPLICATE] + batch + ([checked_since] if checked_since else [])
+                ).fetchall()
+                captured.update(row['link'] for row in rows)
+        return captured
+
+    def record_items(self, items, condition_num):
+        """写入提取到的项目（已存在的链接只更新列表信息，不覆盖采集状态）"""
+        rows = [
+            (item['link'], item['title'], item['info_type'], item['area'],
+             item['pub_date'], condition_num, item.get('extracted_time', self._now()))
+            for item in items
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO tenders (link, title, info_type, area, pub_date, condition_num, extracted_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    title = excluded.title,
+                    info_type = excluded.info_type,
+                    area = excluded.area,
+                    pub_date = excluded.pub_date,
+                    condition_num = excluded.condition_num,
+                    extracted_at = excluded.extracted_at
+                """,
+                rows
+            )
+
+    def compare_content(self, link, page_hash):
+        """
+        将页面哈希与上次采集时的哈希比较
+
+        返回 (比对结果, 上次记录)，比对结果为 new/unchanged/updated
+        """
+        record = self.get(link)
+        if not record or not record.get('content_hash'):
+            return CONTENT_NEW, record
+        if record['content_hash'] == page_hash:
+            return CONTENT_UNCHANGED, record
+        return CONTENT_UPDATED, record
+
+    def mark_checked(self, link):
+        """记录一次详情页抓取（无论内容是否变化）"""
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE tenders SET checked_at = ? WHERE link = ?", (self._now(), link))
+
+    def mark_saved(self, link, local_path, page_hash=None, updated=False):
+        """记录本地保存结果（内容有变化时递增修订号）"""
+        now = self._now()
+        with self._lock, self.conn:
+            self.conn.execute(
+                """
+                UPDATE tenders SET
+                    local_path = ?, captured_at = ?, status = ?,
+                    content_hash = COALESCE(?, content_hash),
+                    revision = revision + ?,
+                    updated_at = CASE WHEN ? THEN ? ELSE updated_at END
+                WHERE link = ?
+                """,
+                (str(local_path), now, STATUS_SAVED, page_hash,
+                 1 if updated else 0, updated, now, link)
+            )
+
+    def mark_duplicate(self, link, page_hash=None):
+        """记录作为近似重复页面跳过（不保存、不上传）"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE tenders SET status = ?, captured_at = ?, content_hash = COALESCE(?, content_hash) "
+                "WHERE link = ?",
+                (STATUS_DUPLICATE, self._now(), page_hash, link)
+            )
+
+    def mark_uploaded(self, link, remote_url):
+        """记录上传成功"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE tenders SET remote_url = ?, status = ? WHERE link = ?",
+                (remote_url, STATUS_UPLOADED, link)
+            )
+
+    def mark_uploaded_by_path(self, local_path, remote_url):
+        """按本地文件路径记录上传成功（用于目录同步），返回对应的链接列表"""
+        with self._lock, self.conn:
+            rows = self.conn.execute(
+                "SELECT link FROM tenders WHERE local_path = ?", (str(local_path),)
+            ).fetchall()
+            self.conn.execute(
+                "UPDATE tenders SET remote_url = ?, status = ? WHERE local_path = ?",
+                (remote_url, STATUS_UPLOADED, str(local_path))
+            )
+        return [row['link'] for row in rows]
+
+    def record_capture(self, link, blob_hash, raw_size, stored_size):
+        """
+        记录一次采集与归档对象的对应关系
+
+        内容与该链接上次采集的归档对象相同时不新增记录，返回是否写入
+        """
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT blob_hash FROM captures WHERE link = ? ORDER BY id DESC LIMIT 1", (link,)
+            ).fetchone()
+            if row and row['blob_hash'] == blob_hash:
+                return False
+            self.conn.execute(
+                "INSERT INTO captures (link, captured_at, blob_hash, raw_size, stored_size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (link, self._now(), blob_hash, raw_size, stored_size)
+            )
+        return True
+
+    def latest_capture(self, link):
+        """查询链接最近一次采集的归档记录"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM captures WHERE link = ? ORDER BY id DESC LIMIT 1", (link,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get(self, link):
+        """按链接查询一条记录"""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM tenders WHERE link = ?", (link,)).fetchone()
+        return dict(row) if row else None
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.conn.close()
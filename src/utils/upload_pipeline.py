@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+后台上传流水线
+浏览器线程只负责把已保存的文件放入有界队列，由上传线程并发消费，
+使页面抓取和FTP传输时间重叠
+"""
+
+import logging
+import queue
+import threading
+import time
+
+
+class UploadPipeline:
+    """生产者/消费者上传流水线"""
+
+    _STOP = object()
+
+    def __init__(self, upload_func, workers=1, queue_size=50, logger=None, on_result=None):
+        """
+        初始化上传流水线
+
+        upload_func(local_path, filename) 返回远程URL，失败时返回None；
+        on_result(result) 在每个文件上传结束后于上传线程中回调
+        """
+        self.upload_func = upload_func
+        self.on_result = on_result
+        self.workers = max(1, int(workers))
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._threads = []
+        self._results = []
+        self._results_lock = threading.Lock()
+
+    def start(self):
+        """启动上传线程"""
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"ftp-upload-{i + 1}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self.logger.info(f"上传流水线已启动: {self.workers} 个上传线程")
+        return self
+
+    def submit(self, local_path, filename, item=None):
+        """提交一个待上传文件（队列满时阻塞，形成背压）"""
+        self._queue.put((local_path, filename, item or {}))
+
+    def _worker(self):
+        """上传线程主循环"""
+        while True:
+            job = self._queue.get()
+            try:
+                if job is self._STOP:
+                    return
+                self._upload_one(*job)
+            finally:
+                self._queue.task_done()
+
+    def _upload_one(self, local_path, filename, item):
+        """上传单个文件并记录结果"""
+        started = time.perf_counter()
+        error = None
+        remote_url = None
+        try:
+            remote_url = self.upload_func(local_path, filename)
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"上传线程处理失败: {filename}: {e}")
+
+        result = {
+            'filename': filename,
+            'local_path': str(local_path),
+            'link': item.get('link'),
+            'remote_url': remote_url,
+            'success': remote_url is not None,
+            'error': error,
+            'elapsed': time.perf_counter() - started
+        }
+        with self._results_lock:
+            self._results.append(result)
+
+        if self.on_result:
+            try:
+                self.on_result(result)
+            except Exception as e:
+                self.logger.error(f"上传结果回调失败: {filename}: {e}")
+
+    def join(self):
+        """等待队列清空并停止所有上传线程，返回每个文件的上传结果"""
+        for _ in self._threads:
+            self._queue.put(self._STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        with self._results_lock:
+            results = list(self._results)
+        return results
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面就绪等待
+基于WebDriverWait的条件等待，页面一旦就绪立即继续，取代固定时长的time.sleep
+"""
+
+import logging
+import time
+
+from selenium.common.exceptions import (
+    StaleElementReferenceException, TimeoutException, WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# 搜索结果表格的数据行选择器
+RESULT_ROW_SELECTORS = [
+    "tbody#result tr",
+    "#result tr",
+    ".custom_table tbody tr",
+    "table.yhzxtab tbody tr",
+    ".custom_table table tbody tr"
+]
+
+# 无结果时页面上出现的提示文字
+NO_RESULT_MARKERS = ["暂无", "没有找到", "无数据"]
+
+# 日期输入框通常随页面一起渲染，不必等满整个超时时间
+DATE_INPUTS_TIMEOUT = 3
+
+
+def _document_ready(driver):
+    """文档加载完成且没有进行中的jQuery请求"""
+    return driver.execute_script(
+        "return document.readyState === 'complete' && "
+        "(!window.jQuery || window.jQuery.active === 0);"
+    )
+
+
+def page_loaded(driver):
+    """页面加载完成"""
+    return _document_ready(driver)
+
+
+def result_table_present(driver):
+    """结果表格已出现数据行，或页面显示无结果"""
+    if not _document_ready(driver):
+        return False
+    return driver.execute_script(
+        """
+        var selectors = arguments[0], markers = arguments[1];
+        for (var i = 0; i < selectors.length; i++) {
+            if (document.querySelectorAll(selectors[i]).length > 0) return true;
+        }
+        if (document.querySelectorAll('table tr').length > 1) return true;
+        var text = document.body ? document.body.innerText : '';
+        for (var j = 0; j < markers.length; j++) {
+            if (text.indexOf(markers[j]) >= 0) return true;
+        }
+        return false;
+        """,
+        RESULT_ROW_SELECTORS, NO_RESULT_MARKERS
+    )
+
+
+def date_inputs_ready(driver):
+    """自定义时间范围的两个日期输入框已可见（页面上没有这类输入框时无需等待）"""
+    if not _document_ready(driver):
+        return False
+    return driver.execute_script(
+        """
+        var inputs = document.querySelectorAll("input[onclick*='WdatePicker'], input.Wdate");
+        if (inputs.length === 0) return true;
+        var visible = 0;
+        for (var i = 0; i < inputs.length; i++) {
+            if (inputs[i].offsetParent !== null) visible++;
+        }
+        return visible >= 2;
+        """
+    )
+
+
+def result_signature(driver):
+    """当前结果行的文本摘要，用于判断结果是否已被替换"""
+    return driver.execute_script(
+        """
+        var selectors = arguments[0];
+        for (var i = 0; i < selectors.length; i++) {
+            var rows = document.querySelectorAll(selectors[i]);
+            if (rows.length > 0) {
+                var parts = [];
+                for (var j = 0; j < rows.length; j++) parts.push(rows[j].textContent);
+                return parts.join('\\n');
+            }
+        }
+        return null;
+        """,
+        RESULT_ROW_SELECTORS
+    )
+
+
+def detail_body_loaded(driver):
+    """详情页正文已加载"""
+    if not _document_ready(driver):
+        return False
+    return driver.execute_script(
+        "return !!document.body && document.body.innerText.trim().length > 0;"
+    )
+
+
+# 各类页面的命名就绪条件
+READY_CONDITIONS = {
+    'page_loaded': page_loaded,
+    'result_table': result_table_present,
+    'date_inputs': date_inputs_ready,
+    'detail_body': detail_body_loaded
+}
+
+
+class PageWaiter:
+    """命名条件等待器"""
+
+    def __init__(self, driver, timeout=10, poll_frequency=0.2, logger=None):
+        """初始化等待器"""
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.logger = logger or logging.getLogger('zhaobiao_spider')
+        self._marked_row = None
+        self._marked_signature = None
+
+    def until(self, condition, name, timeout=None):
+        """
+        等待条件成立并记录实际耗时
+
+        条件成立返回True，超时返回False（由调用方决定是否继续）
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        try:
+            WebDriverWait(
+                self.driver, timeout,
+                poll_frequency=self.poll_frequency,
+                ignored_exceptions=(WebDriverException,)
+            ).until(condition)
+            elapsed = time.perf_counter() - started
+            self.logger.info(f"等待[{name}]完成，耗时 {elapsed:.2f}s")
+            return True
+        except TimeoutException:
+            elapsed = time.perf_counter() - started
+            self.logger.warning(f"等待[{name}]超时，耗时 {elapsed:.2f}s")
+            return False
+
+    def wait_for(self, name, timeout=None):
+        """按名称等待预定义的页面就绪条件"""
+        if timeout is None and name == 'date_inputs':
+            timeout = min(self.timeout, DATE_INPUTS_TIMEOUT)
+        return self.until(READY_CONDITIONS[name], name, timeout)
+
+    def mark_page(self):
+        """
+        记录当前页面状态，用于判断后续操作是否已刷新结果
+
+        在页面上做标记（整页跳转后消失），并记住第一条结果行及全部结果行的文本
+        """
+        self.driver.execute_script("window.__zhaobiaoSpiderMark = true;")
+        rows = []
+        for selector in RESULT_ROW_SELECTORS:
+            rows = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if rows:
+                break
+        self._marked_row = rows[0] if rows else None
+        self._marked_signature = result_signature(self.driver)
+
+    def _refreshed(self, driver):
+        """标记后页面已跳转、原结果行已从文档中移除，或结果内容已变化"""
+        if not driver.execute_script("return !!window.__zhaobiaoSpiderMark;"):
+            return True
+        if self._marked_row is not None:
+            try:
+                self._marked_row.is_enabled()
+            except StaleElementReferenceException:
+                return True
+        return result_signature(driver) != self._marked_signature
+
+    def wait_for_refresh(self, name, timeout=None):
+        """
+        等待点击后结果被替换（整页跳转或AJAX更新均可识别），再等待指定条件就绪
+
+        在超时前未观察到刷新时返回False，调用方不应把旧结果当作新结果
+        """
+        if not self.until(self._refreshed, 'refresh', timeout):
+            return False
+        return self.wait_for(name)
+
+    def wait_for_value(self, element, value, timeout=None):
+        """等待输入框的值变为指定内容"""
+        return self.until(
+            lambda driver: element.get_attribute('value') == value,
+            'input_value', timeout
+        )
@@ -8,8 +8,8 @@ Author: Assistant
 Date: 2025-06-09
 """
 
+import copy
 import json
-import time
 import os
 import sys
 import subprocess
@@ -17,8 +17,9 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 import shutil
-import ftplib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # 第三方库导入
 from selenium import webdriver
@@ -33,6 +34,30 @@ from selenium.common.exceptions import (
 from bs4 import BeautifulSoup
 import requests
 
+from utils.driver_pool import DriverPool, WorkerQueue, add_cookies
+from utils.driver_resolver import DriverResolver
+from utils.exporters import ItemExporter
+from utils.ftp_session import FTPSessionPool
+from utils.ftp_sync import FTPSync
+from utils.html_annotator import render_info_header, render_meta_tags, write_annotated
+from utils.http_fetcher import DetailPageFetcher
+from utils.keyword_classifier import KeywordClassifier
+from utils.listing_parser import parse_listing
+from utils.metrics import RunMetrics, timed
+from utils.near_duplicates import NearDuplicateIndex
+from utils.page_archive import PageArchive
+from utils.page_search import PageSearchIndex, visible_text
+from utils.preflight import PreflightCheck, PreflightRunner
+from utils.rate_limiter import HostRateLimiter
+from utils.resource_policy import ResourcePolicy
+from utils.session_store import SessionStore
+from utils.site_index import SiteIndex
+from utils.tender_store import (
+    TenderStore, content_hash, CONTENT_NEW, CONTENT_UNCHANGED, CONTENT_UPDATED, STATUS_UPLOADED
+)
+from utils.upload_pipeline import UploadPipeline
+from utils.waits import PageWaiter
+
 
 class ZhaobiaoSpider:
     """招标信息爬虫主类"""
@@ -41,8 +66,35 @@ class ZhaobiaoSpider:
         """初始化爬虫"""
         self.config = self.load_config()
         self.driver = None
+        self.driver_path = None
+        self.driver_pool = None
+        self.waiter = None
         self.wait_time = self.config['basic_config']['wait_time']
         self.logger = self.setup_logger()
+        self.metrics = RunMetrics(logger=self.logger)
+        self.classifier = self.setup_classifier()
+        self.ftp_pool = None
+        self.upload_pipeline = None
+        self.http_fetcher = None
+        self.tender_store = None
+        self.exporter = None
+        self.page_archive = None
+        self.site_index = None
+        self.page_search = None
+        self.near_duplicates = None
+        self.driver_lock = threading.Lock()
+        self.rate_limiter = self.setup_rate_limiter()
+        self.resource_policy = ResourcePolicy(
+            self.config.get('resource_policy', {}),
+            self.config.get('browser_config', {}),
+            logger=self.logger
+        )
+        session_config = self.config.get('session_config', {})
+        self.session_store = SessionStore(
+            session_config.get('cookie_file', 'data/session_cookies.json'),
+            max_age_hours=session_config.get('max_age_hours', 72),
+            logger=self.logger
+        ) if session_config.get('persist_cookies', False) else None
         
         # 确保必要的目录存在
         self.ensure_directories()
@@ -88,79 +140,427 @@ class ZhaobiaoSpider:
         for directory in directories:
             Path(directory).mkdir(parents=True, exist_ok=True)
     
-    def system_check(self):
-        """系统自检"""
-        print("\n" + "="*80)
-        print("🔧 系统自检开始")
-        print("="*80)
+    def setup_rate_limiter(self):
+        """根据配置创建按主机划分的令牌桶限速器"""
+        basic_config = self.config['basic_config']
+        rate = basic_config.get('requests_per_second')
+        if rate is None:
+            # 兼容旧配置：由请求间隔换算速率
+            delay = basic_config.get('request_delay', 0)
+            rate = 1.0 / delay if delay > 0 else 0
+        return HostRateLimiter(rate, basic_config.get('burst_size', 1))
+    
+    def setup_classifier(self):
+        """把各分类的关键词（及search_config.default_keywords）编译为一个匹配自动机"""
+        classification_config = self.config.get('classification_config', {})
+        if not classification_config.get('enabled', False):
+            return None
         
-        checks = []
+        categories = dict(classification_config.get('categories', {}))
+        default_keywords = self.config.get('search_config', {}).get('default_keywords', [])
+        if default_keywords:
+            categories['关注关键词'] = list(categories.get('关注关键词', [])) + default_keywords
+        if not categories:
+            return None
+        
+        classifier = KeywordClassifier(categories)
+        self.logger.info(f"关键词分类器已加载: {len(categories)}个分类，{len(classifier)}个关键词")
+        return classifier
+    
+    def get_ftp_pool(self):
+        """获取FTP会话池（首次使用时创建，整个运行期间复用）"""
+        if self.ftp_pool is None:
+            ftp_config = self.config['ftp_config']
+            self.ftp_pool = FTPSessionPool(
+                ftp_config,
+                size=ftp_config.get('pool_size', 1),
+                timeout=ftp_config.get('timeout', 30),
+                logger=self.logger
+            )
+        return self.ftp_pool
+    
+    def setup_tender_store(self):
+        """打开招标信息索引库"""
+        database_config = self.config.get('database_config', {})
+        if database_config.get('type') != 'sqlite':
+            return False
+        
+        try:
+            self.tender_store = TenderStore(database_config['sqlite_path'], logger=self.logger)
+            print(f"✅ 招标信息索引库已打开: {database_config['sqlite_path']}")
+            return True
+        except Exception as e:
+            print(f"⚠️  索引库打开失败，将不做增量去重: {e}")
+            self.logger.warning(f"索引库打开失败: {e}")
+            self.tender_store = None
+            return False
+    
+    def setup_page_archive(self):
+        """打开内容寻址的页面归档（链接与归档的对应关系记录在索引库中）"""
+        data_config = self.config['data_config']
+        archive_config = data_config.get('archive', {})
+        if not archive_config.get('enabled', False) or not self.tender_store:
+            return False
         
-        # 1. 检查Python版本
         try:
-            python_version = sys.version.split()[0]
-            print(f"✅ Python版本: {python_version}")
-            checks.append(True)
+            self.page_archive = PageArchive(
+                data_config.get('raw_data_dir', 'data/raw'),
+                compression=archive_config.get('compression', 'zstd'),
+                level=archive_config.get('level'),
+                logger=self.logger
+            )
+            return True
         except Exception as e:
-            print(f"❌ Python版本检查失败: {e}")
-            checks.append(False)
+            print(f"⚠️  页面归档初始化失败: {e}")
+            self.logger.warning(f"页面归档初始化失败: {e}")
+            self.page_archive = None
+            return False
+    
+    def archive_page(self, link, page_source):
+        """归档原始页面内容，同样的内容只写入一次"""
+        if not self.page_archive:
+            return None
         
-        # 2. 检查必要目录
         try:
-            for directory in ["config", "data", "logs"]:
-                if Path(directory).exists():
-                    print(f"✅ 目录存在: {directory}")
-                else:
-                    print(f"❌ 目录缺失: {directory}")
-                    checks.append(False)
-            if all(Path(d).exists() for d in ["config", "data", "logs"]):
-                checks.append(True)
+            blob_hash, raw_size, stored_size, written = self.page_archive.store(page_source)
+            if written:
+                self.metrics.add_bytes('archived', stored_size)
+            # 内容未变化的重复采集不新增记录
+            self.tender_store.record_capture(link, blob_hash, raw_size, stored_size)
+            if written:
+                self.logger.info(f"页面已归档: {blob_hash[:12]} ({raw_size} -> {stored_size} 字节)")
+            return blob_hash
         except Exception as e:
-            print(f"❌ 目录检查失败: {e}")
-            checks.append(False)
+            self.logger.warning(f"页面归档失败: {link}: {e}")
+            return None
+    
+    def release_local_copy(self, link, local_path):
+        """
+        详情页已归档并上传后删除本地保存的HTML副本
+
+        原始内容保留在归档中，上传后的页面保留在FTP服务器上；
+        配置data_config.archive.keep_local_copy为true时保留本地副本
+        """
+        archive_config = self.config['data_config'].get('archive', {})
+        if not self.page_archive or archive_config.get('keep_local_copy', False):
+            return
+        if not self.tender_store.latest_capture(link):
+            return  # 未归档成功的页面保留本地副本
         
-        # 3. 检查配置文件
         try:
-            config_files = ["config/settings.json"]
-            for config_file in config_files:
-                if Path(config_file).exists():
-                    print(f"✅ 配置文件存在: {config_file}")
-                else:
-                    print(f"❌ 配置文件缺失: {config_file}")
-                    checks.append(False)
-            if all(Path(f).exists() for f in config_files):
-                checks.append(True)
+            Path(local_path).unlink(missing_ok=True)
+            self.metrics.incr('local_copies_released')
+        except OSError as e:
+            self.logger.warning(f"本地副本删除失败: {local_path}: {e}")
+    
+    def setup_page_search(self):
+        """打开详情页全文索引（与招标信息索引库共用数据库）"""
+        database_config = self.config.get('database_config', {})
+        if not database_config.get('full_text_index', False) or not self.tender_store:
+            return False
+        
+        try:
+            self.page_search = PageSearchIndex(database_config['sqlite_path'], logger=self.logger)
+            return True
+        except Exception as e:
+            print(f"⚠️  全文索引打开失败: {e}")
+            self.logger.warning(f"全文索引打开失败: {e}")
+            self.page_search = None
+            return False
+    
+    def index_page_text(self, item, body_text, local_path):
+        """把已保存详情页的正文写入全文索引"""
+        if not self.page_search:
+            return
+        
+        try:
+            with self.metrics.span('item.index'):
+                self.page_search.index_page(item['link'], item, body_text, local_path)
+        except Exception as e:
+            self.logger.warning(f"全文索引更新失败: {item['link']}: {e}")
+    
+    def setup_near_duplicates(self):
+        """打开近似重复索引（与招标信息索引库共用数据库）"""
+        dedup_config = self.config.get('dedup_config', {})
+        if not dedup_config.get('enabled', False) or not self.tender_store:
+            return False
+        
+        try:
+            self.near_duplicates = NearDuplicateIndex(
+                self.config['database_config']['sqlite_path'],
+                max_distance=dedup_config.get('max_distance', 3),
+                logger=self.logger
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️  近似重复索引打开失败: {e}")
+            self.logger.warning(f"近似重复索引打开失败: {e}")
+            self.near_duplicates = None
+            return False
+    
+    def check_near_duplicate(self, item, body_text):
+        """登记详情页指纹；与已采集页面近似重复时返回规范项目链接，并记录到item中"""
+        if not self.near_duplicates or not body_text:
+            return None
+        
+        try:
+            canonical_link, distance = self.near_duplicates.register(item['link'], body_text)
+        except Exception as e:
+            self.logger.warning(f"近似重复检测失败: {item['link']}: {e}")
+            return None
+        if not canonical_link:
+            return None
+        
+        print(f"🔁 与已采集项目近似重复 (距离{distance}): {canonical_link}")
+        self.logger.info(f"近似重复: {item['link']} -> {canonical_link} (距离{distance})")
+        self.metrics.incr('items_near_duplicate')
+        
+        record = self.tender_store.get(canonical_link) if self.tender_store else None
+        item['duplicate_of'] = canonical_link
+        item['duplicate_of_url'] = (record and record.get('remote_url')) or canonical_link
+        return canonical_link
+    
+    def site_index_dir(self):
+        """索引页的本地输出目录（未启用站点索引时返回None）"""
+        index_config = self.config['save_config'].get('site_index', {})
+        if not index_config.get('enabled', False):
+            return None
+        return index_config.get(
+            'output_dir', str(Path(index_config.get('state_dir', 'data/site_index')) / 'pages')
+        )
+    
+    def setup_site_index(self):
+        """打开静态站点索引（索引页单独保存，上传到详情页所在的远程目录）"""
+        output_dir = self.site_index_dir()
+        if not output_dir:
+            return False
+        
+        try:
+            self.site_index = SiteIndex(
+                self.config['save_config']['site_index'].get('state_dir', 'data/site_index'),
+                output_dir,
+                logger=self.logger
+            )
+            return True
         except Exception as e:
-            print(f"❌ 配置文件检查失败: {e}")
-            checks.append(False)
+            print(f"⚠️  站点索引初始化失败: {e}")
+            self.logger.warning(f"站点索引初始化失败: {e}")
+            self.site_index = None
+            return False
+    
+    def publish_site_index(self):
+        """重新生成有变化的索引页，并与详情页一样上传"""
+        if not self.site_index:
+            return
         
-        # 4. 检查ChromeDriver
         try:
-            driver_path = Path("drivers") / "chromedriver.exe"
-            if driver_path.exists():
-                print(f"✅ ChromeDriver存在: {driver_path}")
-                checks.append(True)
+            written = self.site_index.flush()
+        except Exception as e:
+            print(f"⚠️  索引页生成失败: {e}")
+            self.logger.warning(f"索引页生成失败: {e}")
+            return
+        if not written:
+            return
+        
+        print(f"🗂️  已更新 {len(written)} 个索引页")
+        # 同步模式下索引页会随目录同步一起上传
+        if not self.upload_enabled() or self.sync_mode():
+            return
+        
+        for local_path, filename in written:
+            if self.upload_pipeline:
+                self.upload_pipeline.submit(local_path, filename)
             else:
-                print(f"⚠️  ChromeDriver未找到，将尝试自动下载")
-                checks.append(True)  # 允许自动下载
+                self.upload_to_ftp(local_path, filename)
+    
+    def setup_exporter(self):
+        """按data_config.output_formats打开结构化数据导出"""
+        data_config = self.config['data_config']
+        formats = data_config.get('output_formats', [])
+        if not formats:
+            return False
+        
+        try:
+            self.exporter = ItemExporter(
+                data_config.get('processed_data_dir', 'data/processed'),
+                formats,
+                logger=self.logger
+            )
+            return True
         except Exception as e:
-            print(f"❌ ChromeDriver检查失败: {e}")
-            checks.append(False)
+            print(f"⚠️  数据导出初始化失败: {e}")
+            self.logger.warning(f"数据导出初始化失败: {e}")
+            self.exporter = None
+            return False
+    
+    def close_exporter(self):
+        """关闭导出文件并汇报输出位置"""
+        if self.exporter is None:
+            return
+        
+        paths = self.exporter.paths
+        self.exporter.close()
+        print(f"📑 已导出 {self.exporter.count} 条招标信息:")
+        for fmt, path in paths.items():
+            print(f"   {fmt}: {path}")
+        self.exporter = None
+    
+    def record_upload_result(self, result):
+        """把上传结果写入索引库"""
+        if self.tender_store and result['success'] and result.get('link'):
+            self.tender_store.mark_uploaded(result['link'], result['remote_url'])
+            self.release_local_copy(result['link'], result['local_path'])
+    
+    @timed('ftp_sync')
+    def sync_to_ftp(self):
+        """把本地保存目录（及索引页目录）增量同步到FTP（只上传新增或变化的文件，支持断点续传）"""
+        ftp_config = self.config['ftp_config']
+        local_dirs = [self.config['save_config']['local_save_dir']]
+        if self.site_index_dir():
+            local_dirs.append(self.site_index_dir())
+        print(f"\n🔄 正在同步 {', '.join(local_dirs)} 到FTP: {ftp_config['host']}{ftp_config['remote_path']}")
+        
+        def on_uploaded(local_path, filename):
+            self.metrics.incr('files_uploaded')
+            self.metrics.add_bytes('uploaded', os.path.getsize(local_path))
+            if self.tender_store:
+                links = self.tender_store.mark_uploaded_by_path(local_path, ftp_config['web_base_url'] + filename)
+                if links:
+                    self.release_local_copy(links[0], local_path)
         
-        # 5. 检查FTP连接
         try:
-            ftp_config = self.config['ftp_config']
-            with ftplib.FTP() as ftp:
-                ftp.connect(ftp_config['host'], ftp_config['port'], timeout=10)
-                ftp.login(ftp_config['username'], ftp_config['password'])
-                print(f"✅ FTP连接正常: {ftp_config['host']}")
-                checks.append(True)
+            ftp_sync = FTPSync(self.get_ftp_pool(), logger=self.logger)
+            summary = {'uploaded': 0, 'resumed': 0, 'skipped': 0, 'failed': 0}
+            for local_dir in local_dirs:
+                if not Path(local_dir).is_dir():
+                    continue
+                for key, count in ftp_sync.sync(local_dir, ftp_config['remote_path'], on_uploaded=on_uploaded).items():
+                    summary[key] += count
+            print(f"✅ 同步完成: 新上传 {summary['uploaded']} 个，续传 {summary['resumed']} 个，"
+                  f"跳过 {summary['skipped']} 个，失败 {summary['failed']} 个")
+            self.logger.info(f"FTP同步完成: {summary}")
+            return summary['failed'] == 0
         except Exception as e:
-            print(f"❌ FTP连接失败: {e}")
-            checks.append(False)
+            print(f"❌ FTP同步失败: {e}")
+            self.logger.error(f"FTP同步失败: {e}")
+            return False
+    
+    def run_sync(self):
+        """只执行一次FTP同步（不启动浏览器）"""
+        try:
+            self.setup_tender_store()
+            return self.sync_to_ftp()
+        finally:
+            self.cleanup()
+            self.write_metrics()
+    
+    def start_upload_pipeline(self):
+        """启动后台上传流水线"""
+        ftp_config = self.config['ftp_config']
+        self.upload_pipeline = UploadPipeline(
+            self.upload_to_ftp,
+            workers=ftp_config.get('upload_workers', 1),
+            queue_size=ftp_config.get('upload_queue_size', 50),
+            logger=self.logger,
+            on_result=self.record_upload_result
+        ).start()
+    
+    def finish_upload_pipeline(self):
+        """等待上传队列清空并汇报每个文件的上传结果"""
+        if self.upload_pipeline is None:
+            return []
+        
+        print("\n⏳ 正在等待上传队列完成...")
+        results = self.upload_pipeline.join()
+        self.upload_pipeline = None
+        
+        uploaded = [r for r in results if r['success']]
+        failed = [r for r in results if not r['success']]
+        
+        print(f"📤 上传完成: 成功 {len(uploaded)} 个，失败 {len(failed)} 个")
+        for result in failed:
+            print(f"❌ 上传失败: {result['filename']}" + (f" ({result['error']})" if result['error'] else ""))
+        
+        self.logger.info(f"上传队列完成: 成功{len(uploaded)}个，失败{len(failed)}个")
+        return results
+    
+    def upload_enabled(self):
+        """是否启用FTP上传"""
+        return self.config['ftp_config'].get('enabled', True)
+    
+    def sync_mode(self):
+        """是否使用目录同步方式上传（抓取结束后统一同步，而不是逐个文件上传）"""
+        return self.config['ftp_config'].get('upload_mode', 'immediate') == 'sync'
+    
+    def check_python_version(self):
+        """检查Python版本"""
+        return True, f"Python版本: {sys.version.split()[0]}"
+    
+    def check_directories(self):
+        """检查必要目录"""
+        missing = [d for d in ["config", "data", "logs"] if not Path(d).exists()]
+        if missing:
+            return False, f"目录缺失: {', '.join(missing)}"
+        return True, "目录存在: config, data, logs"
+    
+    def check_config_files(self):
+        """检查配置文件"""
+        config_file = "config/settings.json"
+        if Path(config_file).exists():
+            return True, f"配置文件存在: {config_file}"
+        return False, f"配置文件缺失: {config_file}"
+    
+    def check_chromedriver(self):
+        """检查ChromeDriver（不联网）"""
+        driver_path = DriverResolver(logger=self.logger).resolve(allow_download=False)
+        if driver_path:
+            return True, f"ChromeDriver存在: {driver_path}"
+        return True, "ChromeDriver未找到，将尝试自动下载"  # 允许自动下载
+    
+    def check_ftp(self):
+        """检查FTP连接（连接保留在会话池中供上传复用）"""
+        ftp_config = self.config['ftp_config']
+        self.get_ftp_pool().check()
+        return True, f"FTP连接正常: {ftp_config['host']}"
+    
+    @timed('system_check')
+    def system_check(self):
+        """系统自检（独立检查项并发执行，稳定的结果按TTL缓存）"""
+        print("\n" + "="*80)
+        print("🔧 系统自检开始")
+        print("="*80)
         
-        success_rate = sum(checks) / len(checks) * 100
-        print(f"\n📊 自检完成，成功率: {success_rate:.1f}% ({sum(checks)}/{len(checks)})")
+        preflight_config = self.config.get('preflight_config', {})
+        cache_ttl = preflight_config.get('cache_ttl_seconds', 3600)
+        fast_start = preflight_config.get('fast_start', False)
+        
+        checks = [
+            PreflightCheck("Python版本", self.check_python_version),
+            PreflightCheck("目录", self.check_directories, cache_ttl=cache_ttl),
+            PreflightCheck("配置文件", self.check_config_files, cache_ttl=cache_ttl),
+            PreflightCheck("ChromeDriver", self.check_chromedriver, cache_ttl=cache_ttl),
+            # 快速启动模式下FTP连接推迟到第一次上传时建立
+            PreflightCheck("FTP连接", self.check_ftp, enabled=self.upload_enabled() and not fast_start)
+        ]
+        
+        runner = PreflightRunner(
+            preflight_config.get('cache_file', 'logs/preflight_cache.json'),
+            logger=self.logger
+        )
+        results = runner.run(checks, parallel=preflight_config.get('parallel', True))
+        
+        for result in results:
+            icon = "✅" if result['ok'] else "❌"
+            suffix = " (缓存)" if result['cached'] else ""
+            print(f"{icon} {result['message']}{suffix}")
+        
+        skipped = [check.name for check in checks if not check.enabled]
+        if skipped:
+            print(f"⏭️  已跳过: {', '.join(skipped)}")
+        
+        passed = sum(1 for result in results if result['ok'])
+        success_rate = passed / len(results) * 100
+        print(f"\n📊 自检完成，成功率: {success_rate:.1f}% ({passed}/{len(results)})")
         
         if success_rate < 80:
             print("❌ 自检失败，请解决上述问题后重试")
@@ -169,42 +569,66 @@ class ZhaobiaoSpider:
         print("✅ 系统自检通过，可以继续执行")
         return True
     
+    def resolve_driver_path(self):
+        """确定ChromeDriver路径（同一次运行中只解析一次）"""
+        if self.driver_path:
+            return self.driver_path
+        
+        # 优先使用缓存清单或本地ChromeDriver，Chrome版本变化时才联网下载
+        self.driver_path = DriverResolver(logger=self.logger).resolve()
+        print(f"✅ 使用ChromeDriver: {self.driver_path}")
+        
+        return self.driver_path
+    
+    def create_driver(self, use_profile=False):
+        """按配置创建一个新的Chrome浏览器实例（use_profile时使用持久化的用户目录）"""
+        # 设置Chrome选项
+        chrome_options = Options()
+        browser_config = self.config.get('browser_config', {})
+        
+        if browser_config.get('headless', False):
+            chrome_options.add_argument('--headless')
+        
+        # 添加Chrome选项
+        for option in browser_config.get('chrome_options', []):
+            chrome_options.add_argument(option)
+        
+        # 设置窗口大小
+        window_size = browser_config.get('window_size', [1920, 1080])
+        chrome_options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
+        
+        # 持久化的Chrome用户目录（同一目录只能被一个浏览器使用）
+        user_data_dir = self.config.get('session_config', {}).get('user_data_dir')
+        if use_profile and user_data_dir:
+            profile_path = Path(user_data_dir).resolve()
+            profile_path.mkdir(parents=True, exist_ok=True)
+            chrome_options.add_argument(f'--user-data-dir={profile_path}')
+        
+        # 禁用图片/JavaScript等内容设置
+        prefs = self.resource_policy.chrome_prefs()
+        if prefs:
+            chrome_options.add_experimental_option('prefs', prefs)
+        
+        service = Service(self.resolve_driver_path())
+        
+        # 创建WebDriver实例
+        return webdriver.Chrome(service=service, options=chrome_options)
+    
+    @timed('setup_driver')
     def setup_driver(self):
         """设置Chrome浏览器驱动"""
         print("\n🔧 正在设置浏览器驱动...")
         
         try:
-            # 设置Chrome选项
-            chrome_options = Options()
-            browser_config = self.config.get('browser_config', {})
-            
-            if browser_config.get('headless', False):
-                chrome_options.add_argument('--headless')
-            
-            # 添加Chrome选项
-            for option in browser_config.get('chrome_options', []):
-                chrome_options.add_argument(option)
-            
-            # 设置窗口大小
-            window_size = browser_config.get('window_size', [1920, 1080])
-            chrome_options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
-            
-            # 优先使用本地ChromeDriver
-            local_driver_path = Path("drivers") / "chromedriver.exe"
-            if local_driver_path.exists():
-                print(f"✅ 使用本地ChromeDriver: {local_driver_path}")
-                service = Service(str(local_driver_path))
-            else:
-                try:
-                    from webdriver_manager.chrome import ChromeDriverManager
-                    service = Service(ChromeDriverManager().install())
-                    print("✅ 使用自动下载的ChromeDriver")
-                except Exception as e:
-                    print(f"❌ ChromeDriver设置失败: {e}")
-                    return False
+            try:
+                self.resolve_driver_path()
+            except Exception as e:
+                print(f"❌ ChromeDriver设置失败: {e}")
+                return False
             
-            # 创建WebDriver实例
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver = self.create_driver(use_profile=True)
+            self.waiter = PageWaiter(self.driver, self.wait_time, logger=self.logger)
+            self.resource_policy.apply(self.driver, 'login')
             print("✅ 浏览器驱动设置成功")
             return True
             
@@ -213,22 +637,109 @@ class ZhaobiaoSpider:
             self.logger.error(f"浏览器驱动设置失败: {e}")
             return False
     
-    def prompt_user_login(self):
-        """提示用户登录"""
-        print("\n" + "="*60)
-        print("🔐 用户登录阶段")
-        print("="*60)
-        print("1. 请在打开的浏览器中登录 zhaobiao.cn")
-        print("2. 确保登录成功后能看到用户信息")
-        print("3. 登录完成后，回到此窗口确认")
-        print("="*60)
+    def spawn_worker(self, driver):
+        """
+        创建使用指定浏览器的工作副本
+
+        索引库、导出、站点索引、运行指标、上传队列和限速器在副本间共享（各自内部加锁）；
+        浏览器、等待器和HTTP会话每个副本各用一个
+        """
+        worker = copy.copy(self)
+        worker.driver = driver
+        if self.http_fetcher:
+            worker.http_fetcher = self.http_fetcher.fork()
+        worker.waiter = PageWaiter(driver, self.wait_time, logger=self.logger)
+        worker.driver_lock = threading.Lock()
+        self.resource_policy.apply(driver, 'listing')
+        return worker
+    
+    def process_conditions(self, conditions):
+        """处理所有定制条件，配置了多个浏览器时并行处理，返回每个条件的处理结果"""
+        pool_size = min(
+            self.config['browser_config'].get('driver_pool_size', 1),
+            len(conditions)
+        )
+        
+        if pool_size <= 1:
+            return {condition_num: self.process_condition(condition_num) for condition_num in conditions}
+        
+        print(f"\n🧩 正在启动 {pool_size} 个浏览器并行处理定制条件...")
+        self.driver_pool = DriverPool(self.driver, self.create_driver, pool_size, logger=self.logger)
+        drivers = self.driver_pool.start()
+        workers = WorkerQueue([self] + [self.spawn_worker(driver) for driver in drivers[1:]])
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(drivers), thread_name_prefix='condition') as executor:
+            futures = {
+                executor.submit(workers.run, ZhaobiaoSpider.process_condition, condition_num): condition_num
+                for condition_num in conditions
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        # 保持与条件顺序一致
+        return {condition_num: results[condition_num] for condition_num in conditions}
+    
+    def restore_session(self):
+        """尝试恢复上次保存的登录会话，成功返回True"""
+        session_config = self.config.get('session_config', {})
+        
+        # 持久化用户目录中可能仍保留有效的登录状态
+        if session_config.get('user_data_dir') and self.check_login_status():
+            return True
+        
+        if not self.session_store:
+            return False
+        
+        cookies = self.session_store.load()
+        if not cookies:
+            return False
+        
+        print(f"🍪 正在恢复保存的登录会话 ({len(cookies)} 个Cookie)...")
+        add_cookies(self.driver, cookies)
+        self.driver.get(self.config['basic_config']['target_url'])
+        
+        if self.check_login_status():
+            return True
+        
+        print("⚠️  保存的登录会话已失效，需要重新登录")
+        self.session_store.clear()
+        return False
+    
+    def save_session(self):
+        """保存当前登录会话供下次运行使用"""
+        if not self.session_store:
+            return
         
+        try:
+            count = self.session_store.save(self.driver)
+            print(f"💾 登录会话已保存 ({count} 个Cookie)")
+        except Exception as e:
+            print(f"⚠️  登录会话保存失败: {e}")
+            self.logger.warning(f"登录会话保存失败: {e}")
+    
+    @timed('login')
+    def prompt_user_login(self):
+        """提示用户登录（优先恢复已保存的会话）"""
         try:
             # 打开网站
             target_url = self.config['basic_config']['target_url']
             print(f"🌐 正在打开网站: {target_url}")
             self.driver.get(target_url)
             
+            if self.restore_session():
+                print("✅ 已恢复登录会话，跳过手动登录")
+                self.save_session()
+                return True
+            
+            print("\n" + "="*60)
+            print("🔐 用户登录阶段")
+            print("="*60)
+            print("1. 请在打开的浏览器中登录 zhaobiao.cn")
+            print("2. 确保登录成功后能看到用户信息")
+            print("3. 登录完成后，回到此窗口确认")
+            print("="*60)
+            
             # 等待用户手动登录
             while True:
                 user_input = input("\n⏳ 登录完成后输入 'y' 确认，输入 'q' 退出: ").strip().lower()
@@ -240,6 +751,7 @@ class ZhaobiaoSpider:
                     # 检查登录状态
                     if self.check_login_status():
                         print("✅ 登录确认成功")
+                        self.save_session()
                         return True
                     else:
                         print("❌ 登录检查失败，请重新登录")
@@ -259,7 +771,7 @@ class ZhaobiaoSpider:
         try:
             # 刷新页面获取最新状态
             self.driver.refresh()
-            time.sleep(3)
+            self.waiter.wait_for('page_loaded')
             
             # 检查登录标识
             login_indicators = [
@@ -298,6 +810,52 @@ class ZhaobiaoSpider:
             print(f"❌ 登录状态检查失败: {e}")
             return False
     
+    def setup_http_fetcher(self):
+        """登录成功后导出浏览器会话，用于免浏览器抓取详情页"""
+        fetch_config = self.config.get('fetch_config', {})
+        if not fetch_config.get('enable_http_fetch', False):
+            return False
+        
+        try:
+            self.http_fetcher = DetailPageFetcher(fetch_config, logger=self.logger)
+            cookie_count = self.http_fetcher.load_driver_session(self.driver)
+            print(f"✅ 已导出登录会话 ({cookie_count} 个Cookie)，详情页将优先通过HTTP抓取")
+            return True
+        except Exception as e:
+            print(f"⚠️  导出登录会话失败，详情页将使用浏览器抓取: {e}")
+            self.logger.warning(f"导出登录会话失败: {e}")
+            self.http_fetcher = None
+            return False
+    
+    @timed('item.navigate')
+    def fetch_detail_page(self, url):
+        """获取详情页HTML：优先HTTP抓取，需要JavaScript时回退到浏览器"""
+        # 每个实际发出的请求占用一个令牌：HTTP抓取失败回退到浏览器是对站点的第二次请求
+        if self.http_fetcher:
+            self.rate_limiter.acquire(url)
+            page_source = self.http_fetcher.fetch(url)
+            if page_source is not None:
+                return page_source
+            print("🔄 页面需要浏览器渲染，回退到浏览器")
+        
+        # 浏览器只能被一个线程使用；在新标签页中打开，保持结果列表页不被离开
+        with self.driver_lock:
+            self.rate_limiter.acquire(url)
+            list_window = self.driver.current_window_handle
+            self.driver.switch_to.new_window('tab')
+            try:
+                self.resource_policy.apply(self.driver, 'detail')
+                self.driver.get(url)
+                
+                # 等待正文加载
+                self.waiter.wait_for('detail_body')
+                
+                return self.driver.page_source
+            finally:
+                self.driver.close()
+                self.driver.switch_to.window(list_window)
+    
+    @timed('navigate_to_member_center')
     def navigate_to_member_center(self):
         """导航到会员中心"""
         print("\n🏠 正在导航到会员中心...")
@@ -307,7 +865,7 @@ class ZhaobiaoSpider:
             print(f"🌐 正在访问: {member_center_url}")
             
             self.driver.get(member_center_url)
-            time.sleep(3)
+            self.waiter.wait_for('page_loaded')
             
             # 检查是否成功进入会员中心
             if "会员中心" in self.driver.page_source or "homePageUc" in self.driver.current_url:
@@ -322,6 +880,7 @@ class ZhaobiaoSpider:
             self.logger.error(f"导航到会员中心失败: {e}")
             return False
     
+    @timed('navigate_to_customize')
     def navigate_to_customize(self):
         """进入个性化项目定制页面"""
         print("\n🎯 正在进入个性化项目定制...")
@@ -331,7 +890,7 @@ class ZhaobiaoSpider:
             print(f"🌐 正在访问: {customize_url}")
             
             self.driver.get(customize_url)
-            time.sleep(3)
+            self.waiter.wait_for('page_loaded')
             
             # 检查是否成功进入定制页面
             if "定制" in self.driver.page_source or "ucFocusCustomize" in self.driver.current_url:
@@ -346,17 +905,21 @@ class ZhaobiaoSpider:
             self.logger.error(f"进入个性化项目定制页面失败: {e}")
             return False
     
+    @timed('process_condition')
     def process_condition(self, condition_num):
         """处理指定的定制条件"""
         print(f"\n📋 正在处理定制条件{condition_num:02d}...")
         
         try:
             # 构建条件URL
-            condition_url = f"https://center.zhaobiao.cn/www/ucFocusCustomize/listOrder?keyNo={condition_num}"
+            condition_url = self.config['member_center_config'].get(
+                'condition_url_template',
+                "https://center.zhaobiao.cn/www/ucFocusCustomize/listOrder?keyNo={condition_num}"
+            ).format(condition_num=condition_num)
             print(f"🌐 正在访问: {condition_url}")
             
             self.driver.get(condition_url)
-            time.sleep(3)
+            self.waiter.wait_for('page_loaded')
             
             # 设置时间范围
             if not self.set_time_range():
@@ -374,6 +937,7 @@ class ZhaobiaoSpider:
             self.logger.error(f"处理定制条件{condition_num:02d}失败: {e}")
             return False
     
+    @timed('set_time_range')
     def set_time_range(self):
         """设置时间范围为最近指定天数"""
         print("📅 正在设置时间范围...")
@@ -389,8 +953,8 @@ class ZhaobiaoSpider:
             
             print(f"⏰ 设置时间范围: {start_time_str} 至 {end_time_str}")
             
-            # 等待页面加载
-            time.sleep(2)
+            # 等待日期输入框就绪
+            self.waiter.wait_for('date_inputs')
 
             # 查找时间输入框（使用通用选择器）
             time_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='text']")
@@ -442,13 +1006,13 @@ class ZhaobiaoSpider:
             self.driver.execute_script("arguments[0].focus();", start_input)
             start_input.clear()
             start_input.send_keys(start_time_str)
-            time.sleep(1)
+            self.waiter.wait_for_value(start_input, start_time_str, timeout=2)
 
             # 设置结束时间
             self.driver.execute_script("arguments[0].focus();", end_input)
             end_input.clear()
             end_input.send_keys(end_time_str)
-            time.sleep(1)
+            self.waiter.wait_for_value(end_input, end_time_str, timeout=2)
 
             print("✅ 时间范围设置成功")
             self.logger.info(f"时间范围设置成功: {start_time_str} 至 {end_time_str}")
@@ -460,13 +1024,15 @@ class ZhaobiaoSpider:
             print("⚠️  继续执行后续步骤...")
             return True  # 不作为致命错误
 
+    @timed('click_search_button')
     def click_search_button(self):
         """点击搜索按钮"""
         print("🔍 正在点击搜索按钮...")
 
         try:
-            # 等待页面稳定
-            time.sleep(2)
+            # 等待页面稳定，并标记当前页面以便识别搜索后的刷新
+            self.waiter.wait_for('page_loaded')
+            self.waiter.mark_page()
 
             # 方法1：使用JavaScript直接查找搜索按钮
             js_script = """
@@ -491,7 +1057,7 @@ class ZhaobiaoSpider:
             result = self.driver.execute_script(js_script)
             if result:
                 print("✅ 通过JavaScript成功点击搜索按钮")
-                time.sleep(3)  # 等待搜索结果加载
+                self.waiter.wait_for_refresh('result_table')  # 等待搜索结果加载
                 return True
 
             # 方法2：通过CSS选择器查找
@@ -520,7 +1086,7 @@ class ZhaobiaoSpider:
                                 try:
                                     self.driver.execute_script("arguments[0].click();", button)
                                     print("✅ 通过XPath成功点击搜索按钮")
-                                    time.sleep(3)
+                                    self.waiter.wait_for_refresh('result_table')
                                     return True
                                 except:
                                     continue
@@ -529,7 +1095,7 @@ class ZhaobiaoSpider:
                         if button.is_displayed() and button.is_enabled():
                             self.driver.execute_script("arguments[0].click();", button)
                             print(f"✅ 通过选择器 {selector} 成功点击搜索按钮")
-                            time.sleep(3)
+                            self.waiter.wait_for_refresh('result_table')
                             return True
                 except:
                     continue
@@ -546,7 +1112,7 @@ class ZhaobiaoSpider:
                         if text == "搜索" or "搜索" in text:
                             self.driver.execute_script("arguments[0].click();", element)
                             print(f"✅ 找到并点击搜索按钮: {text}")
-                            time.sleep(3)
+                            self.waiter.wait_for_refresh('result_table')
                             return True
                 except:
                     continue
@@ -571,66 +1137,184 @@ class ZhaobiaoSpider:
             return True  # 不作为致命错误
 
     def scrape_results(self, condition_num):
-        """爬取搜索结果 - 逐个保存每个项目的详情页"""
+        """爬取搜索结果 - 逐页提取，并发保存每个项目的详情页"""
         print(f"📊 正在爬取定制条件{condition_num:02d}的搜索结果...")
 
         try:
             # 等待结果加载
-            time.sleep(5)
-
-            # 提取搜索结果数据
-            results_data = self.extract_search_results()
-
-            if not results_data:
-                print("⚠️  未找到搜索结果数据")
-                return False
-
-            print(f"✅ 成功提取 {len(results_data)} 条招标信息")
+            self.waiter.wait_for('result_table')
 
             # 生成时间戳
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
-            # 逐个保存每个项目的详情页面
+            max_pages = self.config['data_config'].get('max_pages_per_search', 1)
+            max_workers = self.config['basic_config'].get('max_concurrent_requests', 1)
+
             success_count = 0
             failed_count = 0
+            skipped_count = 0
+            futures = {}
+            index_offset = 0
+            seen_links = set()
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='detail') as executor:
+                page = 1
+                while True:
+                    # 提取当前页的搜索结果数据
+                    with self.driver_lock:
+                        results_data = self.extract_search_results()
+
+                    page_links = {item['link'] for item in results_data}
+                    captured = set()
+                    if not results_data or page_links <= seen_links:
+                        if page == 1:
+                            print("⚠️  未找到搜索结果数据")
+                            return False
+                        break
+                    seen_links |= page_links
+
+                    print(f"✅ 第{page}页成功提取 {len(results_data)} 条招标信息")
+                    self.metrics.incr('listing_pages')
+                    self.metrics.incr('items_extracted', len(results_data))
+
+                    # 增量抓取：跳过已成功采集的链接（超过recheck_hours未抓取的链接重新检查内容变化）
+                    if self.tender_store:
+                        self.tender_store.record_items(results_data, condition_num)
+                        if self.config['database_config'].get('skip_captured', True):
+                            captured = self.tender_store.captured_links(page_links, self.recheck_since())
+                            if captured:
+                                print(f"⏭️  跳过 {len(captured)} 条已采集的招标信息")
+                                skipped_count += len(captured)
+                                self.metrics.incr('items_skipped_captured', len(captured))
+
+                    # 项目序号跨页连续，避免文件名冲突
+                    for item in results_data:
+                        item['index'] += index_offset
+                        item['page'] = page
+                    index_offset = max(item['index'] for item in results_data)
+
+                    # 按标题做关键词分类
+                    if self.classifier:
+                        for item in results_data:
+                            self.classifier.tag(item)
+
+                    # 增量写出结构化数据（已采集的链接在之前的运行中已导出）
+                    if self.exporter:
+                        with self.metrics.span('export'):
+                            self.exporter.write_items(
+                                [item for item in results_data if item['link'] not in captured],
+                                condition_num=condition_num
+                            )
+
+                    # 当前页的详情页交给线程池处理（请求速率由令牌桶控制）
+                    for item in results_data:
+                        if item['link'] in captured:
+                            continue
+                        future = executor.submit(self.save_individual_project, item, condition_num, timestamp)
+                        futures[future] = item
+
+                    if page >= max_pages:
+                        break
 
-            for i, item in enumerate(results_data, 1):
-                print(f"\n📄 正在处理第 {i}/{len(results_data)} 个项目...")
-                print(f"📝 项目标题: {item['title'][:50]}...")
-                print(f"📋 信息类型: {item['info_type']}")
-                print(f"📍 地区: {item['area']}")
-                print(f"📅 发布时间: {item['pub_date']}")
+                    # 详情页处理的同时，浏览器预先加载下一页
+                    with self.driver_lock:
+                        has_next = self.go_to_next_page()
+                    if not has_next:
+                        break
+                    page += 1
 
-                # 保存项目详情页面
-                if self.save_individual_project(item, condition_num, timestamp):
-                    success_count += 1
-                    print(f"✅ 项目 {i} 保存成功")
-                else:
-                    failed_count += 1
-                    print(f"❌ 项目 {i} 保存失败")
+                for future in as_completed(futures):
+                    item = futures[future]
+                    print(f"\n📄 项目 {item['index']} (第{item['page']}页): {item['title'][:50]}...")
+                    print(f"📋 信息类型: {item['info_type']} | 📍 地区: {item['area']} | 📅 发布时间: {item['pub_date']}")
 
-                # 添加请求间隔，避免请求过于频繁
-                time.sleep(self.config['basic_config']['request_delay'])
+                    if future.result():
+                        success_count += 1
+                        print(f"✅ 项目 {item['index']} 保存成功")
+                    else:
+                        failed_count += 1
+                        print(f"❌ 项目 {item['index']} 保存失败")
 
             # 总结结果
-            print(f"\n📊 定制条件{condition_num:02d}处理完成:")
+            print(f"\n📊 定制条件{condition_num:02d}处理完成 (共{page}页):")
             print(f"✅ 成功: {success_count} 个项目")
             print(f"❌ 失败: {failed_count} 个项目")
+            if skipped_count:
+                print(f"⏭️  跳过: {skipped_count} 个已采集项目")
             if success_count + failed_count > 0:
                 print(f"📈 成功率: {success_count/(success_count+failed_count)*100:.1f}%")
 
-            self.logger.info(f"定制条件{condition_num:02d}处理完成: 成功{success_count}个，失败{failed_count}个")
+            self.logger.info(f"定制条件{condition_num:02d}处理完成: {page}页，成功{success_count}个，失败{failed_count}个，跳过{skipped_count}个")
                            
-            return success_count > 0
+            return success_count > 0 or (skipped_count > 0 and failed_count == 0)
 
         except Exception as e:
             print(f"❌ 爬取结果失败: {e}")
             self.logger.error(f"爬取结果失败: {e}")
             return False
 
+    def recheck_since(self):
+        """已采集链接需要重新检查的时间界限（recheck_hours为0时不重新检查）"""
+        recheck_hours = self.config['database_config'].get('recheck_hours', 24)
+        if not recheck_hours:
+            return None
+        return (datetime.now() - timedelta(hours=recheck_hours)).strftime('%Y-%m-%d %H:%M:%S')
+
+    @timed('go_to_next_page')
+    def go_to_next_page(self):
+        """点击下一页，等待新结果加载；没有下一页时返回False"""
+        try:
+            next_selector = self.config['element_selectors'].get('next_page', '.next-page')
+
+            js_script = """
+            var candidates = Array.prototype.slice.call(
+                document.querySelectorAll(arguments[0] + ", a.next, .next a, a[title='下一页']"));
+            var elements = document.querySelectorAll('a, span, button, li');
+            for (var i = 0; i < elements.length; i++) {
+                var text = (elements[i].innerText || '').trim();
+                if (text === '下一页' || text === '下页' || text === '>') candidates.push(elements[i]);
+            }
+            for (var j = 0; j < candidates.length; j++) {
+                var elem = candidates[j];
+                var disabled = elem.hasAttribute('disabled') ||
+                    /disabled/.test(elem.className) ||
+                    (elem.parentElement && /disabled/.test(elem.parentElement.className));
+                if (elem.offsetParent !== null && !disabled) {
+                    elem.click();
+                    return true;
+                }
+            }
+            return false;
+            """
+
+            self.waiter.mark_page()
+            if not self.driver.execute_script(js_script, next_selector):
+                print("📄 已到最后一页")
+                return False
+
+            print("➡️  正在加载下一页...")
+            # 结果未被替换时不能把上一页当作新页面继续处理
+            if not self.waiter.wait_for_refresh('result_table'):
+                print("⚠️  下一页未加载完成，停止翻页")
+                self.logger.warning("下一页未加载完成，停止翻页")
+                return False
+            return True
+
+        except Exception as e:
+            print(f"⚠️  翻页失败: {e}")
+            self.logger.warning(f"翻页失败: {e}")
+            return False
+
+    @timed('extract_search_results')
     def extract_search_results(self):
-        """提取搜索结果数据"""
+        """提取搜索结果数据（单次execute_script在浏览器内完成全部提取）"""
         try:
+            # 可选：使用lxml离线解析页面源码
+            if self.config['data_config'].get('listing_parser') == 'lxml':
+                results = parse_listing(self.driver.page_source, self.driver.current_url)
+                print(f"✅ 离线解析找到 {len(results)} 条招标信息")
+                return results
+
             results = []
 
             # 查找搜索结果表格
@@ -642,69 +1326,77 @@ class ZhaobiaoSpider:
                 ".custom_table tbody"
             ]
 
-            table_found = False
-            for selector in table_selectors:
-                try:
-                    if "tbody" in selector or "#result" in selector:
-                        # 直接查找tbody
-                        rows = self.driver.find_elements(By.CSS_SELECTOR, f"{selector} tr")
-                    else:
-                        # 查找表格中的数据行
-                        rows = self.driver.find_elements(By.CSS_SELECTOR, f"{selector} tbody tr")
+            # 在浏览器内一次性提取所有行，避免逐个元素的远程调用
+            js_script = """
+            var selectors = arguments[0];
+            var rows = [], matched = null;
+            for (var i = 0; i < selectors.length; i++) {
+                var sel = selectors[i];
+                var rowSel = (sel.indexOf('tbody') >= 0 || sel.indexOf('#result') >= 0) ? sel + ' tr' : sel + ' tbody tr';
+                var found = document.querySelectorAll(rowSel);
+                if (found.length > 0) {
+                    rows = Array.prototype.slice.call(found);
+                    matched = sel;
+                    break;
+                }
+            }
+            if (matched === null) {
+                rows = Array.prototype.slice.call(document.querySelectorAll('table tr'));
+                if (rows.length <= 1) return {selector: null, rows: []};
+                rows = rows.slice(1);
+            }
+            var data = rows.map(function (row) {
+                var cells = row.querySelectorAll('td');
+                if (cells.length < 4) return null;
+                var link = cells[0].querySelector('a');
+                if (!link) return {error: 'no link'};
+                return {
+                    title: link.innerText.trim(),
+                    link: link.href,
+                    info_type: cells[1].innerText.trim(),
+                    area: cells[2].innerText.trim(),
+                    pub_date: cells[3].innerText.trim()
+                };
+            });
+            return {selector: matched, rows: data};
+            """
 
-                    if rows:
-                        print(f"✅ 找到搜索结果表格: {selector} (共{len(rows)}行)")
-                        table_found = True
-                        break
-                except:
-                    continue
+            extracted = self.driver.execute_script(js_script, table_selectors)
+            rows = extracted.get('rows') or []
 
-            if not table_found:
+            if extracted.get('selector'):
+                print(f"✅ 找到搜索结果表格: {extracted['selector']} (共{len(rows)}行)")
+            elif rows:
                 print("⚠️  未找到搜索结果表格，尝试通用方法...")
-                # 尝试查找所有表格行
-                rows = self.driver.find_elements(By.CSS_SELECTOR, "table tr")
-                if len(rows) > 1:  # 至少有表头和一行数据
-                    rows = rows[1:]  # 跳过表头
-                    print(f"✅ 使用通用方法找到 {len(rows)} 行数据")
-                else:
-                    return []
+                print(f"✅ 使用通用方法找到 {len(rows)} 行数据")
+            else:
+                return []
+
+            extracted_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-            # 提取每行的数据
+            # 整理每行的数据
             for i, row in enumerate(rows):
-                try:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) >= 4:  # 确保有足够的列
-                        # 提取项目标题和链接
-                        title_cell = cells[0]
-                        title_link = title_cell.find_element(By.TAG_NAME, "a")
-
-                        title = title_link.text.strip()
-                        link = title_link.get_attribute("href")
-
-                        # 提取其他信息
-                        info_type = cells[1].text.strip()
-                        area = cells[2].text.strip()
-                        pub_date = cells[3].text.strip()
-
-                        result_item = {
-                            'index': i + 1,
-                            'title': title,
-                            'link': link,
-                            'info_type': info_type,
-                            'area': area,
-                            'pub_date': pub_date,
-                            'extracted_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-
-                        results.append(result_item)
-
-                        if i < 3:  # 显示前3条
-                            print(f"📝 项目{i+1}: {title[:50]}...")
-
-                except Exception as e:
-                    print(f"⚠️  第{i+1}行数据提取失败: {e}")
+                if row is None:
+                    continue  # 列数不足的行（如表头）
+                if 'error' in row:
+                    print(f"⚠️  第{i+1}行数据提取失败: {row['error']}")
                     continue
 
+                result_item = {
+                    'index': i + 1,
+                    'title': row['title'],
+                    'link': row['link'],
+                    'info_type': row['info_type'],
+                    'area': row['area'],
+                    'pub_date': row['pub_date'],
+                    'extracted_time': extracted_time
+                }
+
+                results.append(result_item)
+
+                if i < 3:  # 显示前3条
+                    print(f"📝 项目{i+1}: {row['title'][:50]}...")
+
             return results
 
         except Exception as e:
@@ -771,37 +1463,23 @@ class ZhaobiaoSpider:
             self.logger.error(f"本地保存失败: {e}")
             return None
 
+    @timed('item.upload')
     def upload_to_ftp(self, local_path, filename):
         """上传文件到FTP服务器"""
         try:
             ftp_config = self.config['ftp_config']
             print(f"📤 正在上传到FTP: {ftp_config['host']}")
 
-            with ftplib.FTP() as ftp:
-                # 连接FTP
-                ftp.connect(ftp_config['host'], ftp_config['port'])
-                ftp.login(ftp_config['username'], ftp_config['password'])
-
-                # 切换到目标目录
-                try:
-                    ftp.cwd(ftp_config['remote_path'])
-                except:
-                    # 如果目录不存在，尝试创建
-                    try:
-                        ftp.mkd(ftp_config['remote_path'])
-                        ftp.cwd(ftp_config['remote_path'])
-                    except:
-                        print(f"⚠️  无法创建目录: {ftp_config['remote_path']}")
-
-                # 上传文件
-                with open(local_path, 'rb') as f:
-                    ftp.storbinary(f'STOR {filename}', f)
+            # 复用会话池中的已登录连接
+            self.get_ftp_pool().upload(local_path, filename, ftp_config['remote_path'])
 
-                # 生成访问URL
-                remote_url = ftp_config['web_base_url'] + filename
+            # 生成访问URL
+            remote_url = ftp_config['web_base_url'] + filename
+            self.metrics.incr('files_uploaded')
+            self.metrics.add_bytes('uploaded', os.path.getsize(local_path))
 
-                print(f"✅ 文件上传成功: {filename}")
-                return remote_url
+            print(f"✅ 文件上传成功: {filename}")
+            return remote_url
 
         except Exception as e:
             print(f"❌ FTP上传失败: {e}")
@@ -827,6 +1505,12 @@ class ZhaobiaoSpider:
             if not self.prompt_user_login():
                 return False
 
+            # 导出登录会话供HTTP抓取使用
+            self.setup_http_fetcher()
+
+            # 登录完成后按列表页策略拦截无关资源
+            self.resource_policy.apply(self.driver, 'listing')
+
             # 4. 导航到会员中心
             if not self.navigate_to_member_center():
                 return False
@@ -835,21 +1519,37 @@ class ZhaobiaoSpider:
             if not self.navigate_to_customize():
                 return False
 
-            # 6. 处理定制条件
+            # 6. 打开索引库、数据导出并启动后台上传
+            self.setup_tender_store()
+            self.setup_page_archive()
+            self.setup_page_search()
+            self.setup_near_duplicates()
+            self.setup_site_index()
+            self.setup_exporter()
+            if self.upload_enabled() and not self.sync_mode():
+                self.start_upload_pipeline()
+
+            # 7. 处理定制条件
             success_count = 0
-            conditions = [1, 2]  # 定制条件01和02
+            member_center_config = self.config['member_center_config']
+            conditions = member_center_config.get('conditions', [1, 2])[:member_center_config.get('max_conditions', 5)]
+
+            condition_results = self.process_conditions(conditions)
 
             for condition_num in conditions:
-                if self.process_condition(condition_num):
+                if condition_results[condition_num]:
                     success_count += 1
                     print(f"✅ 定制条件{condition_num:02d}处理成功")
                 else:
                     print(f"❌ 定制条件{condition_num:02d}处理失败")
 
-                # 等待间隔
-                time.sleep(2)
+            # 8. 更新索引页，等待上传完成（同步模式下统一同步一次）
+            self.publish_site_index()
+            self.finish_upload_pipeline()
+            if self.upload_enabled() and self.sync_mode():
+                self.sync_to_ftp()
 
-            # 7. 结果总结
+            # 9. 结果总结
             print("\n" + "="*80)
             print("📋 执行结果总结")
             print("="*80)
@@ -869,12 +1569,40 @@ class ZhaobiaoSpider:
             return False
 
         finally:
-            self.cleanup()
+            with self.metrics.span('cleanup'):
+                self.cleanup()
+            self.write_metrics()
+
+    def write_metrics(self):
+        """把本次运行的阶段耗时、计数和字节数写入日志目录"""
+        try:
+            path = self.metrics.write("logs")
+            print(f"📈 运行指标已写入: {path}")
+            self.logger.info(f"运行指标已写入: {path}")
+        except Exception as e:
+            self.logger.warning(f"运行指标写入失败: {e}")
 
     def cleanup(self):
         """清理资源"""
         print("\n🧹 正在清理资源...")
 
+        # 先保存导出文件（Excel只写模式的工作簿在关闭时才落盘），不受后续清理步骤失败的影响
+        if self.exporter:
+            try:
+                self.close_exporter()
+            except Exception as e:
+                print(f"⚠️  导出文件保存失败: {e}")
+                self.logger.error(f"导出文件保存失败: {e}")
+
+        if self.upload_pipeline:
+            try:
+                self.finish_upload_pipeline()
+            except:
+                pass
+
+        if self.driver_pool:
+            self.driver_pool.close()
+
         if self.driver:
             try:
                 self.driver.quit()
@@ -882,37 +1610,136 @@ class ZhaobiaoSpider:
             except:
                 pass
 
+        if self.http_fetcher:
+            try:
+                self.http_fetcher.close()
+            except:
+                pass
+
+        if self.page_search:
+            try:
+                self.page_search.close()
+            except:
+                pass
+
+        if self.near_duplicates:
+            try:
+                self.near_duplicates.close()
+            except:
+                pass
+
+        if self.tender_store:
+            try:
+                self.tender_store.close()
+            except:
+                pass
+
+        if self.ftp_pool:
+            try:
+                self.ftp_pool.close()
+                print("✅ FTP连接已关闭")
+            except:
+                pass
+
         print("✅ 资源清理完成")
 
+    @timed('item.total')
     def save_individual_project(self, item, condition_num, timestamp):
         """访问并保存单个项目的详情页面"""
         try:
             # 访问项目详情页
             print(f"🌐 正在访问: {item['link']}")
-            self.driver.get(item['link'])
+            page_source = self.fetch_detail_page(item['link'])
 
-            # 等待页面加载
-            time.sleep(3)
-
-            # 获取页面内容
-            page_source = self.driver.page_source
+            # 原始内容归档（按内容哈希去重）
+            self.archive_page(item['link'], page_source)
 
-            # 生成安全的文件名（包含信息类型和发布时间）
-            safe_title = self.sanitize_filename(item['title'][:30])
-            safe_info_type = self.sanitize_filename(item['info_type'])
-            safe_date = self.sanitize_filename(item['pub_date'])
+            # 详情页可见文本（内容比对、正文分类、全文索引和近似重复检测共用）
+            match_body = self.classifier and self.config['classification_config'].get('match_body', False)
+            body_text = None
+            try:
+                body_text = visible_text(page_source)
+            except Exception as e:
+                self.logger.warning(f"详情页正文提取失败: {item['link']}: {e}")
+
+            # 可选：结合详情页正文重新分类
+            if match_body and body_text:
+                self.classifier.tag(item, body_text)
+
+            # 内容变化检测：与上次采集的可见文本哈希比较（不受HTTP/浏览器抓取方式影响）
+            page_hash = content_hash(body_text if body_text is not None else page_source)
+            content_state, record = CONTENT_NEW, None
+            if self.tender_store:
+                content_state, record = self.tender_store.compare_content(item['link'], page_hash)
+                self.tender_store.mark_checked(item['link'])
+            item['content_status'] = content_state
+
+            # 已上传的页面本地副本可能已在归档后删除，内容未变化时无需本地文件
+            if content_state == CONTENT_UNCHANGED and record['status'] == STATUS_UPLOADED:
+                print("⏭️  页面内容未变化，跳过保存和上传")
+                self.metrics.incr('items_unchanged')
+                return True
 
-            # 格式: 信息类型_发布时间_项目标题_项目序号.html
-            filename = f"{safe_info_type}_{safe_date}_{safe_title}_{item['index']:03d}.html"
+            if (content_state == CONTENT_UNCHANGED and record['local_path']
+                    and Path(record['local_path']).exists()):
+                # 上次上传未成功：沿用已保存的本地文件，只补传
+                local_path = Path(record['local_path'])
+                filename = local_path.name
+                print("♻️  页面内容未变化，沿用本地文件重新上传")
+            else:
+                if content_state == CONTENT_UPDATED:
+                    print("🔄 页面内容已更新，重新保存并上传")
+
+                # 近似重复检测：跳过，或保存时链接到规范项目
+                if (self.check_near_duplicate(item, body_text)
+                        and self.config['dedup_config'].get('mode', 'link') == 'skip'):
+                    if self.tender_store:
+                        self.tender_store.mark_duplicate(item['link'], page_hash)
+                    print("⏭️  近似重复项目，跳过保存和上传")
+                    return True
 
-            # 保存项目详情页面到本地
-            local_path = self.save_project_detail_page(page_source, filename, item)
+                # 内容更新的页面沿用上次的文件名，覆盖旧文件和索引条目
+                if record and record.get('local_path'):
+                    filename = Path(record['local_path']).name
+                else:
+                    # 生成安全的文件名（包含信息类型和发布时间）
+                    safe_title = self.sanitize_filename(item['title'][:30])
+                    safe_info_type = self.sanitize_filename(item['info_type'])
+                    safe_date = self.sanitize_filename(item['pub_date'])
+
+                    # 格式: 信息类型_发布时间_项目标题_项目序号.html
+                    filename = f"{safe_info_type}_{safe_date}_{safe_title}_{item['index']:03d}.html"
+
+                # 保存项目详情页面到本地
+                local_path = self.save_project_detail_page(page_source, filename, item)
+
+                if local_path and self.tender_store:
+                    self.tender_store.mark_saved(
+                        item['link'], local_path, page_hash,
+                        updated=content_state == CONTENT_UPDATED
+                    )
+                if local_path and self.site_index:
+                    self.site_index.add(filename, item, condition_num)
+                if local_path and body_text is not None:
+                    self.index_page_text(item, body_text, local_path)
 
             if local_path:
+                if not self.upload_enabled() or self.sync_mode():
+                    return True
+
+                if self.upload_pipeline:
+                    # 交给后台上传线程，浏览器继续处理下一个项目
+                    self.upload_pipeline.submit(local_path, filename, item)
+                    print(f"📤 已加入上传队列: {filename}")
+                    return True
+
                 # 上传到FTP
                 remote_url = self.upload_to_ftp(local_path, filename)
 
                 if remote_url:
+                    if self.tender_store:
+                        self.tender_store.mark_uploaded(item['link'], remote_url)
+                        self.release_local_copy(item['link'], local_path)
                     print(f"🌐 上传完成: {remote_url}")
                     return True
 
@@ -944,76 +1771,62 @@ class ZhaobiaoSpider:
             filename = "untitled"
         return filename
 
+    @timed('item.save')
     def save_project_detail_page(self, page_source, filename, item):
-        """保存项目详情页面到本地"""
+        """保存项目详情页面到本地（流式拼接注入内容，不构建完整文档树）"""
         try:
             save_dir = Path(self.config['save_config']['local_save_dir'])
             save_dir.mkdir(parents=True, exist_ok=True)
 
-            # 处理HTML内容
-            soup = BeautifulSoup(page_source, 'html.parser')
-
             # 添加项目元信息到页面头部
-            if soup.head:
-                # 添加项目元信息
-                meta_tags = [
-                    ("project-title", item['title']),
-                    ("info-type", item['info_type']),
-                    ("area", item['area']),
-                    ("publish-date", item['pub_date']),
-                    ("source-url", item['link']),
-                    ("generated-time", datetime.now().isoformat()),
-                    ("generator", "ZhaobiaoSpider"),
-                    ("charset", "UTF-8")
-                ]
-
-                for name, content in meta_tags:
-                    meta_tag = soup.new_tag("meta", attrs={"name": name, "content": str(content)})
-                    soup.head.append(meta_tag)
+            meta_tags = [
+                ("project-title", item['title']),
+                ("info-type", item['info_type']),
+                ("area", item['area']),
+                ("publish-date", item['pub_date']),
+                ("source-url", item['link']),
+                ("generated-time", datetime.now().isoformat()),
+                ("generator", "ZhaobiaoSpider"),
+                ("charset", "UTF-8")
+            ]
 
-            # 在页面顶部添加美化的项目信息展示区
-            if soup.body:
-                info_header = soup.new_tag("div", style="""
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 20px;
-                    margin: 0 0 20px 0;
-                    border-radius: 8px;
-                    box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-                    font-family: 'Microsoft YaHei', Arial, sans-serif;
-                """)
-
-                info_content = soup.new_tag("div")
-                info_content.append(soup.new_tag("h2", style="margin: 0 0 15px 0; font-size: 20px;"))
-                info_content.h2.string = f"📋 {item['title']}"
-
-                info_details = soup.new_tag("div", style="display: flex; flex-wrap: wrap; gap: 15px;")
-
-                details = [
-                    ("📋 信息类型", item['info_type']),
-                    ("📍 地区", item['area']),
-                    ("📅 发布时间", item['pub_date']),
-                    ("🔗 原始链接", f"<a href='{item['link']}' target='_blank' style='color: #ffeb3b;'>{item['link']}</a>"),
-                    ("⏰ 抓取时间", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-                ]
-
-                for label, value in details:
-                    detail_item = soup.new_tag("div", style="background: rgba(255,255,255,0.1); padding: 8px 12px; border-radius: 4px;")
-                    if "原始链接" in label:
-                        detail_item.append(BeautifulSoup(f"<strong>{label}:</strong> {value}", 'html.parser'))
-                    else:
-                        detail_item.string = f"{label}: {value}"
-                    info_details.append(detail_item)
+            # 关键词分类结果
+            if item.get('categories'):
+                meta_tags.append(("categories", item['categories']))
+                meta_tags.append(("matched-keywords", item['matched_keywords']))
+
+            # 近似重复页面记录所属的规范项目
+            if item.get('duplicate_of'):
+                meta_tags.append(("duplicate-of", item['duplicate_of']))
+
+            # 内容较上次采集发生变化（如变更公告）
+            if item.get('content_status') == CONTENT_UPDATED:
+                meta_tags.append(("content-status", "updated"))
 
-                info_content.append(info_details)
-                info_header.append(info_content)
-                soup.body.insert(0, info_header)
+            # 在页面顶部添加美化的项目信息展示区
+            details = [
+                ("📋 信息类型", item['info_type'], None),
+                ("📍 地区", item['area'], None),
+                ("📅 发布时间", item['pub_date'], None),
+                ("🔗 原始链接", item['link'], item['link']),
+                ("⏰ 抓取时间", datetime.now().strftime('%Y-%m-%d %H:%M:%S'), None)
+            ]
+            if item.get('categories'):
+                details.insert(3, ("🏷️ 分类", item['categories'], None))
+            if item.get('duplicate_of'):
+                details.append(("🔁 重复项目", "查看已采集的原项目", item['duplicate_of_url']))
 
             # 保存文件
             file_path = save_dir / filename
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(str(soup))
-
+            write_annotated(
+                page_source,
+                file_path,
+                render_meta_tags(meta_tags),
+                render_info_header(item['title'], details)
+            )
+
+            self.metrics.incr('pages_saved')
+            self.metrics.add_bytes('written', file_path.stat().st_size)
             print(f"✅ 本地保存成功: {filename}")
             return file_path
 
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+结构化数据导出测试
+"""
+
+import csv
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.exporters import ItemExporter
+
+
+class TestItemExporter(unittest.TestCase):
+    """多格式导出测试类"""
+
+    def setUp(self):
+        """创建临时目录"""
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.tmp_dir)
+
+    def export(self, links):
+        """按链接写出一批项目并返回写出的行数"""
+        exporter = ItemExporter(self.tmp_dir, ['csv', 'jsonl'])
+        try:
+            return exporter.write_items([{'link': link, 'title': link} for link in links], condition_num=1)
+        finally:
+            exporter.close()
+
+    def test_each_link_exported_once(self):
+        """同一次运行和同一天的多次运行中，每个链接只导出一次"""
+        self.assertEqual(self.export(["a", "b", "a"]), 2)
+        self.assertEqual(self.export(["a", "c"]), 1)
+
+        csv_path, jsonl_path = sorted(self.tmp_dir.iterdir())
+        with open(csv_path, encoding='utf-8-sig', newline='') as f:
+            self.assertEqual([row['link'] for row in csv.DictReader(f)], ["a", "b", "c"])
+        self.assertEqual(len(jsonl_path.read_text(encoding='utf-8').splitlines()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+详情页流式标注测试
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.html_annotator import render_info_header, render_meta_tags, write_annotated
+
+HEAD = '<meta name="generator" content="ZhaobiaoSpider"/>'
+BODY = '<div class="info">项目信息</div>'
+
+
+class TestHtmlAnnotator(unittest.TestCase):
+    """详情页标注测试类"""
+
+    def setUp(self):
+        """创建临时目录"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = Path(self.tmp_dir) / "page.html"
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.tmp_dir)
+
+    def annotate(self, page_source):
+        """标注页面并返回写出的内容"""
+        written = write_annotated(page_source, self.path, HEAD, BODY)
+        content = self.path.read_text(encoding='utf-8')
+        self.assertEqual(written, len(content))
+        return content
+
+    def test_inserts_before_head_close_and_after_body_open(self):
+        """meta插入</head>之前，信息区插入<body>开始标签之后，其余内容原样保留"""
+        page = '<html><HEAD><title>标题</title></HEAD >\n<body class="x">\n<p>正文</p></body></html>'
+        self.assertEqual(
+            self.annotate(page),
+            f'<html><HEAD><title>标题</title>{HEAD}</HEAD >\n<body class="x">{BODY}\n<p>正文</p></body></html>'
+        )
+
+    def test_missing_insertion_points(self):
+        """缺少head或body时跳过对应的注入"""
+        self.assertEqual(self.annotate('<body><p>正文</p></body>'), f'<body>{BODY}<p>正文</p></body>')
+        self.assertEqual(self.annotate('<p>片段</p>'), '<p>片段</p>')
+
+    def test_escaping(self):
+        """属性和文本中的特殊字符被转义"""
+        meta = render_meta_tags([("project-title", 'A "B" <C> & D')])
+        self.assertEqual(meta, '<meta name="project-title" content="A &quot;B&quot; &lt;C&gt; &amp; D"/>')
+
+        header = render_info_header("<script>", [("🔗 原始链接", "a&b", "https://x/?a=1&b=\"2\"")])
+        self.assertIn("📋 &lt;script&gt;", header)
+        self.assertIn('href="https://x/?a=1&amp;b=&quot;2&quot;"', header)
+        self.assertNotIn("<script>", header)
+
+
+if __name__ == '__main__':
+    unittest.main()
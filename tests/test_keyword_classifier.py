@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多关键词分类测试
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.keyword_classifier import KeywordClassifier
+
+CATEGORIES = {
+    "收单设备": ["收单", "POS机", "智能POS"],
+    "报销设备": ["报销", "自助报销"],
+    "IT和信息化": ["信息系统", "系统集成", "POS机"]
+}
+
+
+class TestKeywordClassifier(unittest.TestCase):
+    """关键词分类器测试类"""
+
+    def setUp(self):
+        """编译分类器"""
+        self.classifier = KeywordClassifier(CATEGORIES)
+
+    def test_overlapping_keywords(self):
+        """重叠和互为后缀的关键词都能命中"""
+        self.assertEqual(self.classifier.find_keywords("某单位自助报销终端采购"), {"报销", "自助报销"})
+        self.assertEqual(self.classifier.find_keywords("智能pos终端"), {"智能pos"})
+        self.assertEqual(self.classifier.find_keywords("智能POS机"), {"智能pos", "pos机"})
+
+    def test_classify_order_and_display(self):
+        """分类按配置顺序、关键词按原始写法排序输出；同一关键词可属于多个分类"""
+        categories, keywords = self.classifier.classify("POS机及信息系统采购", "")
+        self.assertEqual(categories, ["收单设备", "IT和信息化"])
+        self.assertEqual(keywords, ["POS机", "信息系统"])
+
+    def test_matches_brute_force(self):
+        """结果与逐个关键词查找一致"""
+        texts = ["收单设备与系统集成服务", "报销报销收单", "无关内容", "POSPOS机机", ""]
+        keywords = {k.lower() for values in CATEGORIES.values() for k in values}
+        for text in texts:
+            expected = {k for k in keywords if k in text.lower()}
+            self.assertEqual(self.classifier.find_keywords(text), expected, text)
+
+    def test_tag(self):
+        """标题总是参与匹配，结果写入条目字段"""
+        item = self.classifier.tag({'title': "收单设备采购"}, "正文含自助报销")
+        self.assertEqual(item['categories'], "收单设备;报销设备")
+        self.assertEqual(item['matched_keywords'], "报销;收单;自助报销")
+
+        item = self.classifier.tag({'title': "办公家具"})
+        self.assertEqual((item['categories'], item['matched_keywords']), ("", ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+列表页离线解析测试
+用tests/fixtures/list_order.html样本核对parse_listing与浏览器内提取脚本的结果一致
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TESTS_DIR.parent / "src"))
+
+from utils.listing_parser import parse_listing
+
+BASE_URL = "https://center.zhaobiao.cn/www/ucFocusCustomize/listOrder?keyNo=1"
+
+# 浏览器内提取脚本对样本页面的结果（表头行不计入，序号从1开始）
+EXPECTED = [
+    (1, "某银行收单设备采购项目", "https://center.zhaobiao.cn/detail/1_1_1.html", "招标公告", "北京", "2025-06-08"),
+    (2, "自助报销机采购", "https://center.zhaobiao.cn/detail/1_1_2.html", "中标公告", "上海", "2025-06-08"),
+    (3, "财务共享报账终端项目", "https://center.zhaobiao.cn/detail/1_1_3.html", "变更公告", "广东", "2025-06-09")
+]
+
+
+class TestListingParser(unittest.TestCase):
+    """listOrder列表页解析测试类"""
+
+    def setUp(self):
+        """读取样本列表页"""
+        self.page = (TESTS_DIR / "fixtures" / "list_order.html").read_text(encoding='utf-8')
+
+    def assert_matches_script(self, results):
+        """结果应与浏览器内提取脚本逐行一致"""
+        self.assertEqual(
+            [(r['index'], r['title'], r['link'], r['info_type'], r['area'], r['pub_date']) for r in results],
+            EXPECTED
+        )
+
+    def test_parse_string(self):
+        """解析page_source字符串"""
+        self.assert_matches_script(parse_listing(self.page, BASE_URL))
+
+    def test_parse_bytes(self):
+        """解析HTTP原始字节"""
+        self.assert_matches_script(parse_listing(self.page.encode('utf-8'), BASE_URL, encoding='utf-8'))
+
+    def test_parse_string_with_xml_declaration(self):
+        """带编码声明的字符串"""
+        page = '<?xml version="1.0" encoding="utf-8"?>\n' + self.page
+        self.assert_matches_script(parse_listing(page, BASE_URL))
+
+    def test_table_without_tbody(self):
+        """没有显式tbody的表格：浏览器会补全tbody，表头行同样不计入"""
+        page = self.page.replace('<tbody id="result">', '').replace('</tbody>', '')
+        self.assert_matches_script(parse_listing(page, BASE_URL))
+
+    def test_relative_links_without_base_url(self):
+        """不提供base_url时保留原始链接"""
+        results = parse_listing(self.page)
+        self.assertEqual(results[0]['link'], "/detail/1_1_1.html")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+近似重复检测测试
+"""
+
+import hashlib
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.near_duplicates import (
+    NearDuplicateIndex, bands, hamming_distance, simhash, HASH_BITS, SHINGLE_SIZE, _NON_TEXT_RE
+)
+
+DEVICES = ["收单设备", "报账终端", "信息化系统", "服务器", "网络设备", "运维服务", "票据扫描仪", "高拍仪"]
+BODY = ''.join(
+    f"第{i}项：采购{DEVICES[i % 8]}{i + 1}台，交付地点为第{i % 5 + 1}营业网点，质保期{i % 3 + 1}年。"
+    for i in range(30)
+)
+
+
+def reference_simhash(text):
+    """逐位投票的SimHash参考实现"""
+    normalized = _NON_TEXT_RE.sub('', text.lower())
+    shingles = [normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)]
+    votes = [0] * HASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(HASH_BITS):
+            votes[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, vote in enumerate(votes) if vote > 0)
+
+
+class TestSimhash(unittest.TestCase):
+    """SimHash指纹测试类"""
+
+    def test_matches_reference(self):
+        """与逐位投票的参考实现一致"""
+        for text in [BODY, "收单设备", "abc def 123 报销"]:
+            self.assertEqual(simhash(text), reference_simhash(text), text)
+
+    def test_ignores_whitespace_and_punctuation(self):
+        """空白和标点不影响指纹"""
+        self.assertEqual(simhash("收单 设备，采购！"), simhash("收单设备采购"))
+
+    def test_bands_cover_fingerprint(self):
+        """各段拼接还原完整指纹"""
+        fingerprint = simhash(BODY)
+        self.assertEqual(sum(value << (band * 16) for band, value in bands(fingerprint)), fingerprint)
+        self.assertEqual(hamming_distance(0b1011, 0b0110), 3)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """近似重复索引测试类"""
+
+    def setUp(self):
+        """创建临时数据库"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.index = NearDuplicateIndex(Path(self.tmp_dir) / "zhaobiao.db")
+
+    def tearDown(self):
+        """关闭并删除临时数据库"""
+        self.index.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_near_duplicate_joins_canonical(self):
+        """小幅改动的页面归入最早的规范项目，不相关页面不受影响"""
+        self.assertEqual(self.index.register("a", BODY), (None, None))
+
+        canonical, distance = self.index.register("b", BODY + "投标截止时间另行通知。")
+        self.assertEqual(canonical, "a")
+        self.assertLessEqual(distance, 3)
+
+        unrelated = "办公家具采购项目中标结果公示，中标单位为某家具有限公司，中标金额人民币十二万元整。" * 3
+        self.assertEqual(self.index.register("c", unrelated), (None, None))
+        self.assertEqual(self.index.group("a"), ["b"])
+
+    def test_canonical_is_not_reassigned(self):
+        """已是规范项目的页面重新登记时不会归入其他页面"""
+        self.index.register("a", BODY)
+        self.index.register("b", BODY)
+        self.assertEqual(self.index.register("a", BODY), (None, None))
+        self.assertEqual(self.index.group("a"), ["b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+详情页全文检索测试
+"""
+
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.page_search import PageSearchIndex, build_match_query, cjk_bigrams, index_tokens, visible_text
+
+ITEM = {'title': "收单设备采购项目", 'info_type': "招标公告", 'area': "北京", 'pub_date': "2025-06-09"}
+
+
+class TestTokenize(unittest.TestCase):
+    """分词测试类"""
+
+    def test_bigrams(self):
+        """汉字切成重叠二元组，字母数字保持整词"""
+        self.assertEqual(cjk_bigrams("收单设备 POS2025台"), ["收单", "单设", "设备", "pos2025", "台"])
+        self.assertEqual(index_tokens("收单设备，台"), "收单 单设 设备 备 台")
+
+    def test_match_query(self):
+        """多字词组成短语，单字按前缀匹配"""
+        self.assertEqual(build_match_query("收单设备 POS"), '"收单 单设 设备" AND "pos"')
+        self.assertEqual(build_match_query("备"), '"备"*')
+
+    def test_visible_text(self):
+        """去掉脚本样式，支持XML声明"""
+        page = '<?xml version="1.0" encoding="utf-8"?>\n<html><script>x=1</script><body><p>采购  内容</p></body></html>'
+        self.assertEqual(visible_text(page), "采购 内容")
+
+
+class TestPageSearchIndex(unittest.TestCase):
+    """全文索引测试类"""
+
+    def setUp(self):
+        """创建临时数据库"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.tmp_dir) / "zhaobiao.db"
+        self.index = PageSearchIndex(self.db_path)
+
+    def tearDown(self):
+        """关闭并删除临时数据库"""
+        self.index.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def links(self, query):
+        """返回检索结果的链接"""
+        return [result['link'] for result in self.index.search(query)]
+
+    def test_search(self):
+        """短语检索并返回摘要"""
+        self.index.index_page("a", ITEM, "本项目采购收单设备一批，交付地点为北京。")
+        self.index.index_page("b", dict(ITEM, title="办公家具"), "采购办公桌椅。")
+        self.assertEqual(self.links("收单设备"), ["a"])
+        self.assertEqual(sorted(self.links("采购")), ["a", "b"])
+        self.assertIn("【收单设备】", self.index.search("收单设备")[0]['snippet'])
+
+    def test_single_character_at_end_of_run(self):
+        """单字查询能命中连续汉字段末尾的字"""
+        self.index.index_page("a", dict(ITEM, title="项目"), "采购设备，共计十台")
+        self.assertEqual(self.links("台"), ["a"])
+        self.assertEqual(self.links("备"), ["a"])
+        self.assertEqual(self.links("采"), ["a"])
+        self.assertEqual(self.links("桌"), [])
+
+    def test_reindex_replaces_old_terms(self):
+        """更新页面后旧内容不再命中"""
+        self.index.index_page("a", dict(ITEM, title="采购项目"), "采购收单设备")
+        self.index.index_page("a", dict(ITEM, title="采购项目"), "采购报账终端")
+        self.assertEqual(self.links("收单设备"), [])
+        self.assertEqual(self.links("报账终端"), ["a"])
+        self.assertEqual(self.links("端"), ["a"])
+
+    def test_body_is_stored_once(self):
+        """FTS表不保存正文副本"""
+        self.index.index_page("a", ITEM, "采购收单设备")
+        count = self.index.conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'page_fts_content'")
+        self.assertEqual(count.fetchone()[0], 0)
+
+    def test_migrates_stored_content_table(self):
+        """旧版自带正文的FTS表按page_docs重建"""
+        self.index.index_page("a", ITEM, "采购收单设备，共计十台")
+        self.index.close()
+        conn = sqlite3.connect(str(self.db_path))
+        with conn:
+            conn.execute("DROP TABLE page_fts")
+            conn.execute("CREATE VIRTUAL TABLE page_fts USING fts5(title, body, tokenize = 'unicode61')")
+        conn.close()
+
+        self.index = PageSearchIndex(self.db_path)
+        self.assertEqual(self.links("收单设备"), ["a"])
+        self.assertEqual(self.links("台"), ["a"])
+        self.test_body_is_stored_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
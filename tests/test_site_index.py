@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+静态站点索引测试
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.site_index import SiteIndex
+
+ITEM = {'title': "收单设备采购项目", 'info_type': "招标公告", 'area': "北京", 'pub_date': "2025-06-09"}
+
+
+class TestSiteIndex(unittest.TestCase):
+    """索引分片测试类"""
+
+    def setUp(self):
+        """创建临时目录"""
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.state_dir = self.tmp_dir / "site_index"
+        self.output_dir = self.tmp_dir / "site_index" / "pages"
+
+    def tearDown(self):
+        """删除临时目录"""
+        shutil.rmtree(self.tmp_dir)
+
+    def open_index(self):
+        """打开索引"""
+        return SiteIndex(self.state_dir, self.output_dir)
+
+    def test_flush_writes_affected_shards_only(self):
+        """新增页面只重新生成所属的分片和总索引"""
+        index = self.open_index()
+        index.add("a.html", ITEM, 1)
+        written = sorted(name for _, name in index.flush())
+        self.assertEqual(written, [
+            "index.html", "index_condition_01.html", "index_day_20250609.html", "index_type_招标公告.html"
+        ])
+        self.assertTrue((self.output_dir / "index.html").exists())
+        self.assertEqual(index.flush(), [])
+
+        index.add("a.html", ITEM, 1)
+        self.assertEqual(index.flush(), [])  # 信息未变化
+
+        index.add("b.html", dict(ITEM, info_type="中标公告"), 1)
+        self.assertIn("index_type_中标公告.html", [name for _, name in index.flush()])
+
+    def test_entries_survive_interrupted_run(self):
+        """未生成索引页就中断的运行，条目在下次打开时重放"""
+        index = self.open_index()
+        index.add("a.html", ITEM, 1)
+        index.add("b.html", dict(ITEM, pub_date="2025-06-10"), 2)
+        del index  # 模拟中断：没有调用flush
+
+        index = self.open_index()
+        written = {name for _, name in index.flush()}
+        self.assertIn("index_day_20250610.html", written)
+        self.assertIn("index_condition_02.html", written)
+        self.assertIn("a.html", (self.output_dir / "index_condition_01.html").read_text(encoding='utf-8'))
+        self.assertFalse((self.state_dir / "pending.jsonl").exists())
+
+        # 已落盘的条目不再重放
+        self.assertEqual(self.open_index().flush(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
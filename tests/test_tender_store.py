@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+招标信息索引库测试
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.page_search import visible_text
+from utils.tender_store import (
+    TenderStore, content_hash, CONTENT_NEW, CONTENT_UNCHANGED, CONTENT_UPDATED, STATUS_UPLOADED
+)
+
+LINK = "https://www.zhaobiao.cn/detail/1.html"
+ITEM = {'link': LINK, 'title': "收单设备采购项目", 'info_type': "招标公告", 'area': "北京", 'pub_date': "2025-06-09"}
+
+
+class TestTenderIndex(unittest.TestCase):
+    """增量抓取索引测试类"""
+
+    def setUp(self):
+        """创建临时数据库"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = TenderStore(Path(self.tmp_dir) / "zhaobiao.db")
+
+    def tearDown(self):
+        """关闭并删除临时数据库"""
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_record_items_keeps_capture_status(self):
+        """再次提取同一链接只更新列表信息，不覆盖采集状态"""
+        self.store.record_items([ITEM], 1)
+        self.store.mark_saved(LINK, "a.html")
+        self.store.mark_uploaded(LINK, "http://example.com/a.html")
+
+        self.store.record_items([dict(ITEM, title="收单设备采购项目（更正）")], 2)
+        record = self.store.get(LINK)
+        self.assertEqual(record['title'], "收单设备采购项目（更正）")
+        self.assertEqual(record['condition_num'], 2)
+        self.assertEqual(record['status'], STATUS_UPLOADED)
+        self.assertEqual(record['remote_url'], "http://example.com/a.html")
+
+    def test_captured_links(self):
+        """只有已上传或作为重复跳过的链接计为已采集"""
+        links = [f"https://www.zhaobiao.cn/detail/{i}.html" for i in range(1200)]
+        self.store.record_items([dict(ITEM, link=link) for link in links], 1)
+        self.store.mark_saved(links[0], "0.html")
+        self.store.mark_uploaded(links[1], "http://example.com/1.html")
+        self.store.mark_duplicate(links[1100])
+
+        # 超过单批500个参数时分批查询
+        self.assertEqual(self.store.captured_links(links + ["https://other"]), {links[1], links[1100]})
+
+    def test_mark_uploaded_by_path(self):
+        """目录同步按本地路径回写上传状态"""
+        self.store.record_items([ITEM], 1)
+        self.store.mark_saved(LINK, "data/scraped_pages/a.html")
+        self.assertEqual(self.store.mark_uploaded_by_path("data/scraped_pages/a.html", "http://x/a.html"), [LINK])
+        self.assertEqual(self.store.mark_uploaded_by_path("data/scraped_pages/b.html", "http://x/b.html"), [])
+        self.assertEqual(self.store.get(LINK)['status'], STATUS_UPLOADED)
+
+
+class TestContentChange(unittest.TestCase):
+    """内容变化检测测试类"""
+
+    def setUp(self):
+        """创建临时数据库"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = TenderStore(Path(self.tmp_dir) / "zhaobiao.db")
+        self.store.record_items([ITEM], 1)
+
+    def tearDown(self):
+        """关闭并删除临时数据库"""
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_hash_ignores_markup_differences(self):
+        """HTTP原始HTML与浏览器DOM的可见文本相同时哈希一致"""
+        raw = "<html><head><script>var a = 1;</script></head><body><p>采购内容：收单设备</p></body></html>"
+        rendered = ('<html><head><meta name="generated-time" content="now"></head>'
+                    '<body>\n  <p class="x">采购内容：收单设备</p>\n</body></html>')
+        self.assertEqual(content_hash(visible_text(raw)), content_hash(visible_text(rendered)))
+        self.assertNotEqual(content_hash(visible_text(raw)), content_hash("采购内容：报销设备"))
+
+    def test_compare_content(self):
+        """首次采集为new，之后按哈希判断unchanged/updated"""
+        state, record = self.store.compare_content(LINK, "a")
+        self.assertEqual(state, CONTENT_NEW)
+
+        self.store.mark_saved(LINK, "data/scraped_pages/a.html", "a")
+        self.assertEqual(self.store.compare_content(LINK, "a")[0], CONTENT_UNCHANGED)
+
+        state, record = self.store.compare_content(LINK, "b")
+        self.assertEqual(state, CONTENT_UPDATED)
+        self.assertEqual(record['local_path'], "data/scraped_pages/a.html")
+
+        self.store.mark_saved(LINK, record['local_path'], "b", updated=True)
+        record = self.store.get(LINK)
+        self.assertEqual(record['revision'], 1)
+        self.assertIsNotNone(record['updated_at'])
+
+    def test_captured_links_are_rechecked(self):
+        """已上传的链接在重新检查期限之后不再计为已采集"""
+        self.store.mark_saved(LINK, "a.html", "a")
+        self.store.mark_uploaded(LINK, "http://example.com/a.html")
+        self.assertEqual(self.store.captured_links([LINK]), {LINK})
+        self.assertEqual(self.store.captured_links([LINK], "2000-01-01 00:00:00"), {LINK})
+        self.assertEqual(self.store.captured_links([LINK], "2999-01-01 00:00:00"), set())
+
+        self.store.conn.execute("UPDATE tenders SET checked_at = '2999-06-01 00:00:00'")
+        self.assertEqual(self.store.captured_links([LINK], "2999-01-01 00:00:00"), {LINK})
+
+
+if __name__ == '__main__':
+    unittest.main()